@@ -0,0 +1,411 @@
+"""HTTP API для анализа температурных данных.
+
+Результаты анализа всех городов вычисляются при запуске в пуле
+процессов и хранятся в памяти. Пакетная оценка показаний выполняется
+по климатологии дней года; большие пакеты передаются в пул процессов,
+которые открывают ту же климатологию через memory-map. Промежуточные
+результаты для перебора параметров поиска аномалий готовятся при
+запуске каждого процесса пула, и перебор выполняется в пуле, не
+блокируя сервер.
+
+Ответы по умолчанию возвращаются в JSON (orient='split'). Если клиент
+передает заголовок Accept с типом Arrow IPC или msgpack и нужная
+библиотека установлена, ответ кодируется в этом формате.
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from src.config import (
+    API_HOST,
+    API_PORT,
+    API_WORKERS,
+    API_POOL_BATCH_SIZE,
+    API_MAX_REQUEST_SIZE,
+    DATA_DIR,
+    ROLLUP_MAX_POINTS,
+    SWEEP_THRESHOLDS,
+    SWEEP_WINDOWS
+)
+from src.services.analysis_service import AnalysisService, TemperatureAnalysis
+from src.services.climatology_service import (
+    ClimatologyIndex,
+    ClimatologyService
+)
+from src.services.dataset_service import DatasetService
+from src.services.rollup_service import RollupService, TemperatureRollups
+from src.services.storage_service import HistoryStoreService
+from src.services.sweep_service import ParameterSweep, SweepService
+from src.core.logger import logger
+
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+# Состояние процесса-исполнителя, заполняется в _init_worker
+_worker_state: Dict = {}
+
+
+def _init_worker(store_dir: Path, climatology_dir: Path) -> None:
+    """Открытие общих хранилищ в процессе-исполнителе."""
+    store = HistoryStoreService.open(store_dir)
+    _worker_state['store'] = store
+    _worker_state['climatology'] = ClimatologyService.load(climatology_dir)
+    _worker_state['sweep'] = SweepService.prepare(store.to_frame())
+
+
+def _analyze_city(city: str) -> TemperatureAnalysis:
+    """Анализ одного города в процессе-исполнителе."""
+    return asyncio.run(
+        AnalysisService.analyze_city_from_store(_worker_state['store'], city)
+    )
+
+
+def _score_batch(
+    cities: List[str],
+    timestamps: np.ndarray,
+    temperatures: np.ndarray
+) -> np.ndarray:
+    """Оценка пакета показаний в процессе-исполнителе."""
+    return _worker_state['climatology'].score(
+        cities, timestamps, temperatures
+    )
+
+
+def _run_sweep(
+    method: str,
+    windows: List[int],
+    thresholds: List[float]
+) -> pd.DataFrame:
+    """Перебор параметров в процессе-исполнителе."""
+    sweep: ParameterSweep = _worker_state['sweep']
+    if method == 'seasonal':
+        return sweep.seasonal(thresholds)
+    return sweep.rolling(windows, thresholds)
+
+
+def encode_frame(request: web.Request, df: pd.DataFrame) -> web.Response:
+    """Кодирование DataFrame в формат, запрошенный клиентом."""
+    accept = request.headers.get('Accept', '')
+
+    if ARROW_CONTENT_TYPE in accept:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            pa = None
+        if pa is not None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return web.Response(
+                body=sink.getvalue().to_pybytes(),
+                content_type=ARROW_CONTENT_TYPE
+            )
+
+    if MSGPACK_CONTENT_TYPE in accept:
+        try:
+            import msgpack
+        except ImportError:
+            msgpack = None
+        if msgpack is not None:
+            payload = {
+                'columns': list(df.columns),
+                'data': _json_safe(df).values.tolist()
+            }
+            return web.Response(
+                body=msgpack.packb(payload),
+                content_type=MSGPACK_CONTENT_TYPE
+            )
+
+    return web.Response(
+        text=df.to_json(orient='split', index=False, date_format='iso'),
+        content_type='application/json'
+    )
+
+
+def _json_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Преобразование дат в строки ISO для форматов без типа даты."""
+    df = df.copy()
+    for column in df.select_dtypes(include=['datetime']).columns:
+        df[column] = df[column].dt.strftime('%Y-%m-%d')
+    return df
+
+
+def _json_error(error_class, message: str) -> web.HTTPException:
+    """HTTP-исключение с телом {"error": message} в JSON."""
+    return error_class(
+        text=json.dumps({'error': message}, ensure_ascii=False),
+        content_type='application/json'
+    )
+
+
+def _get_analysis(request: web.Request) -> TemperatureAnalysis:
+    """Результат анализа для города из пути запроса."""
+    city = request.match_info['city']
+    analyses = request.app['analyses']
+    if city not in analyses:
+        raise _json_error(web.HTTPNotFound, f"Город {city} не найден")
+    return analyses[city]
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    """Проверка готовности сервиса."""
+    return web.json_response({
+        'status': 'ok',
+        'cities': len(request.app['analyses'])
+    })
+
+
+async def handle_cities(request: web.Request) -> web.Response:
+    """Список городов и количество аномалий по каждому."""
+    df = pd.DataFrame([
+        {'city': city, 'anomalies_count': int(analysis.anomalies_count)}
+        for city, analysis in request.app['analyses'].items()
+    ])
+    return encode_frame(request, df)
+
+
+async def handle_seasonal_stats(request: web.Request) -> web.Response:
+    """Сезонная статистика города."""
+    analysis = _get_analysis(request)
+    stats = analysis.seasonal_stats['temperature'].reset_index()
+    stats['season'] = stats['season'].astype(str)
+    return encode_frame(request, stats)
+
+
+async def handle_anomalies(request: web.Request) -> web.Response:
+    """Исторические аномалии города с фильтром по датам."""
+    analysis = _get_analysis(request)
+    data = analysis.data
+    anomalies = data.loc[
+        data['is_anomaly'].astype(bool),
+        ['timestamp', 'temperature', 'season']
+    ]
+
+    try:
+        if 'start' in request.query:
+            start = pd.Timestamp(request.query['start'])
+            anomalies = anomalies[anomalies['timestamp'] >= start]
+        if 'end' in request.query:
+            end = pd.Timestamp(request.query['end'])
+            anomalies = anomalies[anomalies['timestamp'] <= end]
+    except ValueError as e:
+        raise _json_error(web.HTTPBadRequest, f"Некорректная дата: {e}")
+
+    anomalies = anomalies.assign(season=anomalies['season'].astype(str))
+    return encode_frame(request, anomalies.reset_index(drop=True))
+
+
+async def handle_trend(request: web.Request) -> web.Response:
+    """Температурный ряд города на уровне агрегации, зависящем от периода.
+
+    Параметры запроса: start, end и max_points. Уровень (daily, monthly,
+    yearly) — самый детальный, при котором число точек не превышает
+    max_points; он возвращается в колонке level.
+    """
+    analysis = _get_analysis(request)
+    data = analysis.data
+    try:
+        max_points = int(request.query.get('max_points', ROLLUP_MAX_POINTS))
+        if 'start' in request.query:
+            start = pd.Timestamp(request.query['start'])
+            data = data[data['timestamp'] >= start]
+        if 'end' in request.query:
+            end = pd.Timestamp(request.query['end'])
+            data = data[data['timestamp'] <= end]
+    except ValueError as e:
+        raise _json_error(web.HTTPBadRequest, f"Некорректный параметр: {e}")
+
+    rollups: TemperatureRollups = request.app['rollups']
+    level, series = RollupService.resolve(
+        rollups, data, analysis.city, max_points
+    )
+    if level == 'daily':
+        series = series.assign(
+            min=series['temperature'],
+            max=series['temperature'],
+            anomaly_count=series['is_anomaly'].astype(int)
+        )
+    series = series[['timestamp', 'mean', 'min', 'max', 'anomaly_count']]
+    return encode_frame(
+        request,
+        series.assign(level=level).reset_index(drop=True)
+    )
+
+
+async def handle_score(request: web.Request) -> web.Response:
+    """Пакетная оценка текущих показаний на аномальность.
+
+    Тело запроса: {"readings": [{"city", "timestamp", "temperature"}]}.
+    Ответ содержит только колонку is_anomaly в порядке показаний.
+    """
+    try:
+        body = await request.json()
+        readings = pd.DataFrame(
+            body['readings'],
+            columns=['city', 'timestamp', 'temperature']
+        )
+        timestamps = pd.to_datetime(readings['timestamp'])
+        temperatures = readings['temperature'].astype(float)
+    except (ValueError, KeyError, TypeError) as e:
+        raise _json_error(web.HTTPBadRequest, f"Некорректный запрос: {e}")
+    if timestamps.isna().any():
+        missing = timestamps.index[timestamps.isna()].tolist()
+        raise _json_error(
+            web.HTTPBadRequest,
+            f"Отсутствует timestamp у показаний: {missing[:10]}"
+        )
+    invalid = [
+        i for i, city in enumerate(readings['city'])
+        if not isinstance(city, str)
+    ]
+    if invalid:
+        raise _json_error(
+            web.HTTPBadRequest,
+            f"Город должен быть строкой у показаний: {invalid[:10]}"
+        )
+
+    climatology: ClimatologyIndex = request.app['climatology']
+    if len(readings) > API_POOL_BATCH_SIZE:
+        flags = await asyncio.get_running_loop().run_in_executor(
+            request.app['pool'],
+            _score_batch,
+            readings['city'].tolist(),
+            timestamps.to_numpy(),
+            temperatures.to_numpy()
+        )
+    else:
+        flags = climatology.score(readings['city'], timestamps, temperatures)
+
+    return encode_frame(request, pd.DataFrame({'is_anomaly': flags}))
+
+
+def _parse_list(request: web.Request, name: str, cast, default) -> list:
+    """Список значений из параметра запроса вида 1.5,2,2.5."""
+    if name not in request.query:
+        return list(default)
+    try:
+        return [cast(value) for value in request.query[name].split(',')]
+    except ValueError as e:
+        raise _json_error(
+            web.HTTPBadRequest, f"Некорректный параметр {name}: {e}"
+        )
+
+
+async def handle_sweep(request: web.Request) -> web.Response:
+    """Количество аномалий по городам для набора параметров.
+
+    Параметры запроса: thresholds и windows через запятую,
+    method=seasonal|rolling. Ответ: city, [window], threshold, anomalies.
+    """
+    method = request.query.get('method', 'seasonal')
+    if method not in ('seasonal', 'rolling'):
+        raise _json_error(
+            web.HTTPBadRequest, f"Неизвестное правило: {method}"
+        )
+    thresholds = _parse_list(request, 'thresholds', float, SWEEP_THRESHOLDS)
+    windows = _parse_list(request, 'windows', int, SWEEP_WINDOWS)
+    if any(window < 1 for window in windows):
+        raise _json_error(
+            web.HTTPBadRequest, "Окно должно быть положительным"
+        )
+
+    table = await asyncio.get_running_loop().run_in_executor(
+        request.app['pool'], _run_sweep, method, windows, thresholds
+    )
+
+    levels = list(range(table.columns.nlevels))
+    counts = table.stack(levels).rename('anomalies').reset_index()
+    return encode_frame(request, counts)
+
+
+async def warm_up(app: web.Application) -> None:
+    """Загрузка данных и анализ всех городов в пуле процессов."""
+    dataset = DatasetService.load_or_build(app['data_path'])
+    store, climatology = dataset.store, dataset.climatology
+
+    pool = ProcessPoolExecutor(
+        max_workers=app['workers'],
+        initializer=_init_worker,
+        initargs=(store.directory, climatology.directory)
+    )
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*[
+        loop.run_in_executor(pool, _analyze_city, city)
+        for city in store.cities
+    ])
+
+    app['pool'] = pool
+    app['climatology'] = climatology
+    app['analyses'] = {analysis.city: analysis for analysis in results}
+    app['rollups'] = await RollupService.load_or_build(
+        store, app['analyses']
+    )
+    logger.info(f"API готов: проанализировано городов {len(results)}")
+
+
+async def shutdown(app: web.Application) -> None:
+    """Остановка пула процессов."""
+    pool: Optional[ProcessPoolExecutor] = app.get('pool')
+    if pool is not None:
+        pool.shutdown()
+
+
+def create_app(
+    data_path: Path = DATA_DIR / 'temperature_data.csv',
+    workers: int = API_WORKERS
+) -> web.Application:
+    """Создание приложения aiohttp.
+
+    Args:
+        data_path: Путь к CSV или Parquet с историческими данными
+        workers: Количество процессов в пуле
+
+    Returns:
+        web.Application: Настроенное приложение
+    """
+    app = web.Application(client_max_size=API_MAX_REQUEST_SIZE)
+    app['data_path'] = data_path
+    app['workers'] = workers
+    app.on_startup.append(warm_up)
+    app.on_cleanup.append(shutdown)
+
+    app.router.add_get('/health', handle_health)
+    app.router.add_get('/cities', handle_cities)
+    app.router.add_get('/cities/{city}/seasonal-stats', handle_seasonal_stats)
+    app.router.add_get('/cities/{city}/anomalies', handle_anomalies)
+    app.router.add_get('/cities/{city}/trend', handle_trend)
+    app.router.add_get('/sweep', handle_sweep)
+    app.router.add_post('/score', handle_score)
+    return app
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="HTTP API анализа температур")
+    parser.add_argument(
+        '--data',
+        default=str(DATA_DIR / 'temperature_data.csv'),
+        help="Путь к CSV или Parquet с историческими данными"
+    )
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    parser.add_argument('--workers', type=int, default=API_WORKERS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    web.run_app(
+        create_app(Path(args.data), args.workers),
+        host=args.host,
+        port=args.port
+    )
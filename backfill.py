@@ -0,0 +1,121 @@
+"""Массовая загрузка показаний температуры для многих городов.
+
+Пример запуска против локального сервера воспроизведения:
+    python backfill.py --replay --rounds 365 --output data/ingest/readings
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from src.config import (
+    DATA_DIR,
+    INGEST_BATCH_SIZE,
+    INGEST_CONCURRENCY,
+    INGEST_DIR,
+    OPENWEATHER_API_BASE_URL,
+    OPENWEATHER_API_KEY
+)
+from src.services.dataset_service import DatasetService
+from src.services.ingestion_service import IngestionService
+from replay_server import REPLAY_PATH, create_replay_app
+from src.core.logger import logger
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Массовая загрузка показаний температуры"
+    )
+    parser.add_argument(
+        '--data',
+        default=str(DATA_DIR / 'temperature_data.csv'),
+        help="Набор данных, из которого берется список городов и записи "
+             "для сервера воспроизведения"
+    )
+    parser.add_argument(
+        '--cities',
+        nargs='+',
+        help="Города для опроса (по умолчанию все города из --data)"
+    )
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--interval', type=float, default=0)
+    parser.add_argument(
+        '--output',
+        default=str(INGEST_DIR / 'readings'),
+        help="Каталог Parquet или файл .csv"
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help="Файл контрольной точки (по умолчанию рядом с --output)"
+    )
+    parser.add_argument(
+        '--rollups',
+        help="Каталог месячных и годовых агрегатов загруженных показаний "
+             "(обновляются при каждой записи пакета; аномалии — по "
+             "климатологии --data)"
+    )
+    parser.add_argument('--concurrency', type=int, default=INGEST_CONCURRENCY)
+    parser.add_argument('--batch-size', type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument('--api-key', default=OPENWEATHER_API_KEY)
+    parser.add_argument('--base-url', default=OPENWEATHER_API_BASE_URL)
+    parser.add_argument(
+        '--replay',
+        action='store_true',
+        help="Запустить локальный сервер воспроизведения вместо API"
+    )
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace):
+    """Основная логика загрузки."""
+    # Список городов и климатология для оценки показаний в агрегатах
+    dataset = DatasetService.load_or_build(args.data)
+    cities = args.cities or dataset.store.cities
+    output = Path(args.output)
+    checkpoint_path = (
+        Path(args.checkpoint) if args.checkpoint
+        else output.with_name(output.stem + '.checkpoint.json')
+    )
+
+    runner = None
+    base_url = args.base_url
+    if args.replay:
+        runner = web.AppRunner(create_replay_app(Path(args.data)))
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        base_url = f"http://127.0.0.1:{port}{REPLAY_PATH}"
+        logger.info(f"Сервер воспроизведения запущен: {base_url}")
+
+    try:
+        started = time.perf_counter()
+        checkpoint = await IngestionService.run(
+            cities=cities,
+            rounds=args.rounds,
+            output=output,
+            checkpoint_path=checkpoint_path,
+            api_key=args.api_key,
+            base_url=base_url,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            interval=args.interval,
+            rollups_dir=Path(args.rollups) if args.rollups else None,
+            climatology=dataset.climatology
+        )
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Загрузка завершена за {elapsed:.2f} с: раундов "
+            f"{checkpoint.completed_rounds}, ошибок {len(checkpoint.failed)}"
+        )
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,155 @@
+"""Сравнение статических и интерактивных графиков.
+
+Для каждого способа отрисовки измеряются объем данных, отправляемых
+клиенту за одно взаимодействие, и процессорное время сервера:
+- статические графики: PNG всех фигур matplotlib (как в st.pyplot);
+- интерактивные графики: JSON спецификаций Vega-Lite с агрегированными
+  данными.
+
+Любое взаимодействие в Streamlit (в том числе выделение диапазона с
+on_select="rerun") перезапускает скрипт целиком и заново строит все
+графики. Время измеряется для двух вариантов перезапуска:
+- без кэша: разбор CSV, отпечатки набора данных, загрузка климатологии,
+  хранилища и агрегатов, анализ города и все графики;
+- с кэшем (как в streamlit_app.py): только построение всех графиков.
+"""
+
+import argparse
+import asyncio
+import io
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import matplotlib
+import pandas as pd
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from src.config import DATA_DIR, DEFAULT_CITY  # noqa: E402
+from src.services.analysis_service import AnalysisService  # noqa: E402
+from src.services.dataset_service import DatasetService  # noqa: E402
+from src.services.interactive_visualization_service import (  # noqa: E402
+    InteractiveVisualizationService
+)
+from src.services.rollup_service import RollupService  # noqa: E402
+from src.services.visualization_service import (  # noqa: E402
+    VisualizationService
+)
+from src.utils import parse_csv  # noqa: E402
+from src.core.logger import logger  # noqa: E402
+
+
+def measure(render: Callable[[], List[bytes]], repeats: int) -> Tuple[int, float]:
+    """Средний объем ответа (байт) и процессорное время (мс)."""
+    started = time.process_time()
+    for _ in range(repeats):
+        payloads = render()
+    cpu_ms = (time.process_time() - started) * 1000 / repeats
+    return sum(len(payload) for payload in payloads), cpu_ms
+
+
+def render_static(analysis, rollups) -> List[bytes]:
+    """PNG всех статических графиков."""
+    viz = VisualizationService
+    level, trend = RollupService.resolve(rollups, analysis.data, analysis.city)
+    figures = [
+        viz.plot_temperature_time_series(analysis.data, analysis.city),
+        viz.plot_seasonal_boxplot(analysis.data, analysis.city),
+        viz.plot_temperature_distribution(analysis.data, analysis.city),
+        viz.plot_long_term_trend(trend, analysis.city, level),
+        viz.plot_anomalies_heatmap(
+            rollups.frame('monthly', analysis.city), analysis.city
+        )
+    ]
+    payloads = []
+    for fig in figures:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+        payloads.append(buffer.getvalue())
+        plt.close(fig)
+    return payloads
+
+
+def render_interactive(analysis, rollups, start=None, end=None) -> List[bytes]:
+    """JSON спецификаций всех интерактивных графиков."""
+    viz = InteractiveVisualizationService
+    level, series, anomalies = viz.time_series_data(
+        analysis.data, rollups, analysis.city, start, end
+    )
+    charts = [
+        viz.plot_overview(rollups, analysis.city),
+        viz.plot_temperature_time_series(
+            level, series, anomalies, analysis.city
+        ),
+        viz.plot_seasonal_boxplot(analysis.data, analysis.city),
+        viz.plot_temperature_distribution(analysis.data, analysis.city),
+        viz.plot_anomalies_heatmap(rollups, analysis.city)
+    ]
+    return [chart.to_json().encode() for chart in charts]
+
+
+def prepare(content: str, city: str):
+    """Шаги перезапуска скрипта до построения графиков (без кэша)."""
+    success, message, df = parse_csv(content)
+    if not success:
+        raise ValueError(message)
+    store = DatasetService.from_frame(df).store
+    analysis = asyncio.run(AnalysisService.analyze_city_from_store(store, city))
+    rollups = asyncio.run(RollupService.load_or_build(store))
+    return analysis, rollups
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Сравнение графиков")
+    parser.add_argument(
+        '--data',
+        default=str(DATA_DIR / 'temperature_data.csv'),
+        help="Путь к CSV с историческими данными"
+    )
+    parser.add_argument('--city', default=DEFAULT_CITY)
+    parser.add_argument('--repeats', type=int, default=3)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    content = Path(args.data).read_text(encoding='utf-8')
+    analysis, rollups = prepare(content, args.city)
+
+    last = analysis.data['timestamp'].max()
+    zoom = (last - pd.DateOffset(years=1), last)
+    cases = [
+        ('Статические (PNG)',
+         lambda: render_static(analysis, rollups)),
+        ('Интерактивные (Vega-Lite), без выделения',
+         lambda: render_interactive(analysis, rollups)),
+        ('Интерактивные (Vega-Lite), выделен 1 год',
+         lambda: render_interactive(analysis, rollups, *zoom))
+    ]
+
+    rows = []
+    for name, render in cases:
+        size, cached_ms = measure(render, args.repeats)
+
+        def rerun(render=render):
+            prepare(content, args.city)
+            return render()
+
+        _, uncached_ms = measure(rerun, args.repeats)
+        rows.append((name, size, uncached_ms, cached_ms))
+
+    results = pd.DataFrame(
+        rows,
+        columns=['Способ', 'Байт', 'CPU без кэша, мс', 'CPU с кэшем, мс']
+    ).round(1)
+    logger.info(
+        f"Город {args.city}, строк: {len(analysis.data)}\n"
+        f"{results.to_string(index=False)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Нагрузочное тестирование HTTP API анализа температур.
+
+Отправляет заданное количество запросов с ограниченной параллельностью
+и выводит p50/p99 задержки и пропускную способность.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import aiohttp
+import numpy as np
+
+from src.config import API_PORT
+from src.core.logger import logger
+
+
+def build_score_payload(cities, batch_size: int) -> dict:
+    """Случайный пакет показаний для оценки."""
+    return {
+        'readings': [
+            {
+                'city': random.choice(cities),
+                'timestamp': f"2024-{random.randint(1, 12):02d}-"
+                             f"{random.randint(1, 28):02d}",
+                'temperature': random.uniform(-30, 45)
+            }
+            for _ in range(batch_size)
+        ]
+    }
+
+
+async def run_load_test(
+    base_url: str,
+    endpoint: str,
+    total: int,
+    concurrency: int,
+    batch_size: int
+) -> np.ndarray:
+    """Запуск нагрузочного теста.
+
+    Args:
+        base_url: Адрес API
+        endpoint: Тип запроса ('stats', 'anomalies' или 'score')
+        total: Общее количество запросов
+        concurrency: Количество одновременных запросов
+        batch_size: Размер пакета показаний для 'score'
+
+    Returns:
+        np.ndarray: Задержки запросов в миллисекундах
+    """
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/cities") as response:
+            cities_payload = await response.json()
+        cities = [row[0] for row in cities_payload['data']]
+        payload = build_score_payload(cities, batch_size)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def one_request():
+            city = random.choice(cities)
+            async with semaphore:
+                started = time.perf_counter()
+                if endpoint == 'score':
+                    request = session.post(f"{base_url}/score", json=payload)
+                elif endpoint == 'anomalies':
+                    request = session.get(
+                        f"{base_url}/cities/{city}/anomalies"
+                    )
+                else:
+                    request = session.get(
+                        f"{base_url}/cities/{city}/seasonal-stats"
+                    )
+                async with request as response:
+                    await response.read()
+                    response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*[one_request() for _ in range(total)])
+
+    return np.array(latencies)
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Нагрузочный тест API")
+    parser.add_argument('--url', default=f"http://localhost:{API_PORT}")
+    parser.add_argument(
+        '--endpoint',
+        choices=['stats', 'anomalies', 'score'],
+        default='stats'
+    )
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=100)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    started = time.perf_counter()
+    latencies = asyncio.run(run_load_test(
+        args.url,
+        args.endpoint,
+        args.requests,
+        args.concurrency,
+        args.batch_size
+    ))
+    elapsed = time.perf_counter() - started
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    logger.info(
+        f"{args.endpoint}: {len(latencies)} запросов за {elapsed:.2f} с "
+        f"({len(latencies) / elapsed:.0f} RPS), "
+        f"p50 = {p50:.1f} мс, p99 = {p99:.1f} мс"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,19 @@
+import argparse
 import asyncio
-import pandas as pd
 
-from src.config import DATA_DIR, DEFAULT_CITY, OPENWEATHER_API_KEY
+from src.config import (
+    DATA_DIR,
+    DEFAULT_CITY,
+    OPENWEATHER_API_KEY,
+    SWEEP_THRESHOLDS,
+    SWEEP_WINDOWS
+)
 from src.services.analysis_service import AnalysisService
+from src.services.comparison_service import ComparisonService
+from src.services.dataset_service import DatasetService
+from src.services.query_service import HistoryQuery, QueryService
+from src.services.rollup_service import RollupService, TemperatureRollups
+from src.services.sweep_service import SweepService
 from src.services.weather_service import WeatherService
 from src.core.logger import logger
 
@@ -20,40 +31,158 @@ async def print_temperature_info(
     status = "аномальная" if weather_info.is_anomaly else "нормальная"
     logger.info(
         f"Текущая температура в {city}: {weather_info.temperature}°C "
-        f"({status} для текущего сезона)"
+        f"({status} для текущей даты)"
     )
 
 
-async def print_city_analysis(city: str, analysis: AnalysisService) -> None:
+async def print_city_analysis(
+    city: str,
+    analysis: AnalysisService,
+    rollups: TemperatureRollups
+) -> None:
     """Вывод анализа температуры для города."""
     logger.info(f"Анализ для города {city}:")
     logger.info(f"Сезонная статистика:\n{analysis.seasonal_stats}")
     logger.info(f"Общее количество аномалий: {analysis.anomalies_count}")
 
+    yearly = rollups.frame('yearly', city)
+    logger.info(
+        "Статистика по годам:\n"
+        f"{yearly[['year', 'mean', 'min', 'max', 'anomaly_count']].round(2)}"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Анализ исторических температурных данных"
+    )
+    parser.add_argument(
+        '--data',
+        default=str(DATA_DIR / 'temperature_data.csv'),
+        help="Путь к CSV или Parquet с историческими данными"
+    )
+    parser.add_argument('--city', default=DEFAULT_CITY, help="Город")
+    parser.add_argument(
+        '--compare',
+        action='store_true',
+        help="Загрузить все города и вывести сравнительный анализ"
+    )
+    parser.add_argument('--start', help="Начальная дата (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Конечная дата (YYYY-MM-DD)")
+    parser.add_argument(
+        '--seasons',
+        nargs='+',
+        choices=['winter', 'spring', 'summer', 'autumn'],
+        help="Сезоны для анализа"
+    )
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help="Вывести количество аномалий для набора окон и порогов"
+    )
+    parser.add_argument(
+        '--windows',
+        nargs='+',
+        type=int,
+        default=list(SWEEP_WINDOWS),
+        help="Окна скользящего среднего для перебора (дней)"
+    )
+    parser.add_argument(
+        '--thresholds',
+        nargs='+',
+        type=float,
+        default=list(SWEEP_THRESHOLDS),
+        help="Пороги аномалий для перебора (σ)"
+    )
+    return parser.parse_args()
+
+
+async def print_comparison(analyses: dict) -> None:
+    """Вывод сравнительного анализа городов."""
+    comparison = ComparisonService.build_from_analyses(analyses)
+    logger.info(
+        f"Рейтинг городов по доле аномалий:\n"
+        f"{comparison.anomaly_ranking()}"
+    )
+    logger.info(
+        f"Средняя температура по сезонам:\n{comparison.seasonal_means()}"
+    )
+    logger.info(
+        f"Корреляция температурных отклонений:\n{comparison.correlation()}"
+    )
+    logger.info(
+        f"Дни с аномалиями в нескольких городах:\n"
+        f"{comparison.simultaneous_anomalies().head(10)}"
+    )
+
+
+async def print_sweep(df, windows: list, thresholds: list) -> None:
+    """Вывод таблиц чувствительности к параметрам поиска аномалий."""
+    tables = SweepService.sensitivity(
+        SweepService.prepare(df), windows, thresholds
+    )
+    logger.info(
+        f"Аномалии по сезонному правилу (город × порог):\n"
+        f"{tables['seasonal']}"
+    )
+    logger.info(
+        f"Аномалии относительно скользящего среднего "
+        f"(город × окно, порог):\n{tables['rolling']}"
+    )
+
 
-async def main():
+async def main(args: argparse.Namespace):
     """Основная логика приложения."""
-    # Загружаем данные
-    data_path = DATA_DIR / 'temperature_data.csv'
-    logger.info(f"Загрузка данных из {data_path}")
-    df = pd.read_csv(data_path)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    # Хранилище и климатология строятся по полной истории, поэтому
+    # фильтры запроса не влияют на норму для проверки текущей температуры.
+    # Источник читается целиком, только если они еще не построены
+    logger.info(f"Открытие данных {args.data}")
+    dataset = DatasetService.load_or_build(args.data)
+    store, climatology = dataset.store, dataset.climatology
 
-    # Анализ температурных данных для всех городов
+    # Для анализа из хранилища выбираются только данные запроса
+    query = HistoryQuery(
+        cities=None if args.compare else [args.city],
+        start=args.start,
+        end=args.end,
+        seasons=args.seasons
+    )
+    logger.info(f"Выборка из хранилища: {query}")
+    df = QueryService.read(store, query)
+    if df.empty:
+        logger.error(f"Нет данных по запросу для города {args.city}")
+        return
+
+    # Анализ отфильтрованных данных
     analyses = await AnalysisService.analyze_all_cities_temperature(df)
+    if args.compare:
+        await print_comparison(analyses)
+    if args.sweep:
+        await print_sweep(df, args.windows, args.thresholds)
 
     # Работаем с выбранным городом
-    city = DEFAULT_CITY
+    city = args.city
+    if city not in analyses:
+        # При --compare выборка содержит все города, кроме неизвестных
+        logger.error(f"Нет данных по запросу для города {city}")
+        return
     city_analysis = analyses[city]
 
     # Выводим статистику
-    await print_city_analysis(city, city_analysis)
+    # Сохраненные агрегаты описывают полную историю; для выборки
+    # с фильтрами агрегаты строятся по отфильтрованным данным
+    if args.start or args.end or args.seasons:
+        rollups = RollupService.build(city_analysis.data)
+    else:
+        rollups = await RollupService.load_or_build(store)
+    await print_city_analysis(city, city_analysis, rollups)
 
     # Получаем текущую температуру
     weather_service = WeatherService()
     current_weather = await weather_service.get_current_temperature(
         city,
-        city_analysis,
+        climatology,
         OPENWEATHER_API_KEY
     )
 
@@ -61,4 +190,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))
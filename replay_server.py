@@ -0,0 +1,127 @@
+"""Локальный сервер воспроизведения ответов OpenWeatherMap API.
+
+Отдает исторические показания из набора данных в формате эндпоинта
+/data/2.5/weather. Если запрос содержит параметр round, возвращается
+запись города с этим номером по дате, иначе — следующая по дате запись.
+Так продолженная после перезапуска загрузка получает те же записи, что
+и непрерывная. Позволяет нагружать конвейер загрузки без доступа к сети.
+Дополнительно можно задать задержку ответа и долю ошибок 503.
+"""
+
+import argparse
+import asyncio
+import random
+from pathlib import Path
+
+import numpy as np
+from aiohttp import web
+
+from src.config import DATA_DIR
+from src.services.query_service import QueryService
+from src.core.logger import logger
+
+REPLAY_PATH = "/data/2.5/weather"
+
+
+async def handle_weather(request: web.Request) -> web.Response:
+    """Ответ в формате OpenWeatherMap для следующей записи города."""
+    app = request.app
+    if app['latency'] > 0:
+        await asyncio.sleep(app['latency'])
+    if random.random() < app['failure_rate']:
+        return web.json_response(
+            {'cod': 503, 'message': 'service unavailable'},
+            status=503
+        )
+
+    city = request.query.get('q', '')
+    if city not in app['history']:
+        return web.json_response(
+            {'cod': '404', 'message': 'city not found'},
+            status=404
+        )
+
+    timestamps, temperatures = app['history'][city]
+    if 'round' in request.query:
+        try:
+            position = int(request.query['round']) % len(timestamps)
+        except ValueError:
+            return web.json_response(
+                {'cod': '400', 'message': 'invalid round'},
+                status=400
+            )
+    else:
+        position = app['cursors'][city] % len(timestamps)
+        app['cursors'][city] += 1
+    return web.json_response({
+        'name': city,
+        'dt': int(timestamps[position]),
+        'timezone': 0,
+        'main': {'temp': float(temperatures[position])},
+        'cod': 200
+    })
+
+
+def create_replay_app(
+    data_path: Path = DATA_DIR / 'temperature_data.csv',
+    latency_ms: float = 0,
+    failure_rate: float = 0
+) -> web.Application:
+    """Создание приложения сервера воспроизведения.
+
+    Args:
+        data_path: Путь к CSV или Parquet с историческими данными
+        latency_ms: Искусственная задержка ответа в миллисекундах
+        failure_rate: Доля запросов, завершающихся ошибкой 503
+
+    Returns:
+        web.Application: Настроенное приложение
+    """
+    df = QueryService.read(data_path).sort_values(['city', 'timestamp'])
+    seconds = df['timestamp'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+    temperatures = df['temperature'].to_numpy()
+
+    app = web.Application()
+    app['history'] = {}
+    for city, rows in df.groupby('city', sort=False).indices.items():
+        app['history'][city] = (seconds[rows], temperatures[rows])
+    app['cursors'] = {city: 0 for city in app['history']}
+    app['latency'] = latency_ms / 1000
+    app['failure_rate'] = failure_rate
+    app.router.add_get(REPLAY_PATH, handle_weather)
+
+    logger.info(
+        f"Сервер воспроизведения: {len(app['history'])} городов, "
+        f"{len(df)} записей"
+    )
+    return app
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Локальный сервер воспроизведения OpenWeatherMap API"
+    )
+    parser.add_argument(
+        '--data',
+        default=str(DATA_DIR / 'temperature_data.csv'),
+        help="Путь к CSV или Parquet с историческими данными"
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--failure-rate', type=float, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    web.run_app(
+        create_replay_app(
+            Path(args.data),
+            args.latency_ms,
+            args.failure_rate
+        ),
+        host=args.host,
+        port=args.port
+    )
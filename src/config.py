@@ -11,6 +11,12 @@ logger.info("Загружена конфигурация из .env")
 
 # Пути
 DATA_DIR: Final[Path] = PROJECT_ROOT / "data"
+CLIMATOLOGY_DIR: Final[Path] = DATA_DIR / "climatology"
+STORE_DIR: Final[Path] = DATA_DIR / "store"
+# Отпечатки исходных файлов, для которых уже построены хранилище и нормы
+SOURCE_MANIFEST: Final[Path] = STORE_DIR / "sources.json"
+CACHE_MAX_DATASETS: Final[int] = 8  # наборов данных в кэше на диске
+CSV_CHUNK_SIZE: Final[int] = 100_000  # строк в одной части при чтении CSV
 
 # API настройки
 OPENWEATHER_API_KEY: Final[str] = os.getenv("OPENWEATHER_API_KEY", "")
@@ -20,16 +26,44 @@ OPENWEATHER_API_BASE_URL: Final[str] = \
 # Анализ данных
 ROLLING_WINDOW: Final[int] = 30
 ANOMALY_THRESHOLD: Final[float] = 2.0
+# Значения по умолчанию для перебора параметров поиска аномалий
+SWEEP_WINDOWS: Final[tuple] = (7, 15, 30, 60)
+SWEEP_THRESHOLDS: Final[tuple] = (1.5, 2.0, 2.5, 3.0)
 DEFAULT_CITY: Final[str] = "Moscow"
+CLIMATOLOGY_SMOOTHING_WINDOW: Final[int] = 31  # окно сглаживания (дней)
+MONTH_TO_SEASON: Final[dict] = {
+    12: 'winter', 1: 'winter', 2: 'winter',
+    3: 'spring', 4: 'spring', 5: 'spring',
+    6: 'summer', 7: 'summer', 8: 'summer',
+    9: 'autumn', 10: 'autumn', 11: 'autumn'
+}
+
+# Массовая загрузка данных
+INGEST_DIR: Final[Path] = DATA_DIR / "ingest"
+INGEST_CONCURRENCY: Final[int] = 20  # одновременных запросов к API
+INGEST_BATCH_SIZE: Final[int] = 1000  # строк в одной записи на диск
+INGEST_RETRIES: Final[int] = 3  # попыток запроса для одного города
+
+# Генерация синтетических данных
+GENERATOR_CHUNK_ROWS: Final[int] = 5_000_000  # строк в одной части записи
 
 # Визуализация
 PLOT_FIGSIZE: Final[tuple] = (20, 15)
 PLOT_DPI: Final[int] = 100
+ROLLUP_MAX_POINTS: Final[int] = 500  # макс. точек при выборе уровня агрегации
 TEMPERATURE_COLORS: Final[dict] = {
     'normal': '#1f77b4',
     'anomaly': '#d62728',
     'rolling': '#ff7f0e'
 }
 
+# HTTP API
+API_HOST: Final[str] = os.getenv("API_HOST", "0.0.0.0")
+API_PORT: Final[int] = int(os.getenv("API_PORT", "8080"))
+API_WORKERS: Final[int] = int(os.getenv("API_WORKERS", str(os.cpu_count())))
+# Пакеты показаний больше этого размера оцениваются в пуле процессов
+API_POOL_BATCH_SIZE: Final[int] = 10_000
+API_MAX_REQUEST_SIZE: Final[int] = 64 * 1024 * 1024  # байт
+
 # Кэширование
 CACHE_TTL_SECONDS: Final[int] = 300  # время жизни кэша в секундах (5 минут)
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Dict
 import pandas as pd
 from src.config import ROLLING_WINDOW, ANOMALY_THRESHOLD
+from src.services.storage_service import HistoryStore
 
 
 @dataclass
@@ -18,27 +19,82 @@ class AnalysisService:
 
     @staticmethod
     async def analyze_all_cities_temperature(
-        df: pd.DataFrame
+        df: pd.DataFrame,
+        window: int = ROLLING_WINDOW,
+        threshold: float = ANOMALY_THRESHOLD
     ) -> Dict[str, TemperatureAnalysis]:
-        """Анализ температурных данных для всех городов."""
-        cities = df['city'].unique()
-        analyses = {}
-        for city in cities:
-            analysis = await AnalysisService.analyze_city_temperature(df, city)
-            analyses[city] = analysis
-        return analyses
+        """Анализ температурных данных для всех городов.
+
+        Принимает как полный набор данных, так и результат выборки
+        QueryService; строки разбиваются по городам за один проход.
+        """
+        return {
+            city: AnalysisService._analyze_city_data(
+                city_data.copy(), city, window, threshold
+            )
+            for city, city_data in df.groupby('city', sort=False)
+        }
 
     @staticmethod
     async def analyze_city_temperature(
         df: pd.DataFrame,
-        city: str
+        city: str,
+        window: int = ROLLING_WINDOW,
+        threshold: float = ANOMALY_THRESHOLD
     ) -> TemperatureAnalysis:
         """Анализ температурных данных для конкретного города."""
         city_data = df[df['city'] == city].copy()
+        return AnalysisService._analyze_city_data(
+            city_data, city, window, threshold
+        )
+
+    @staticmethod
+    async def analyze_all_cities_from_store(
+        store: HistoryStore,
+        window: int = ROLLING_WINDOW,
+        threshold: float = ANOMALY_THRESHOLD
+    ) -> Dict[str, TemperatureAnalysis]:
+        """Анализ температурных данных всех городов из хранилища."""
+        return {
+            city: await AnalysisService.analyze_city_from_store(
+                store, city, window, threshold
+            )
+            for city in store.cities
+        }
+
+    @staticmethod
+    async def analyze_city_from_store(
+        store: HistoryStore,
+        city: str,
+        window: int = ROLLING_WINDOW,
+        threshold: float = ANOMALY_THRESHOLD
+    ) -> TemperatureAnalysis:
+        """Анализ температурных данных города по срезу хранилища."""
+        return AnalysisService._analyze_city_data(
+            store.city_frame(city), city, window, threshold
+        )
+
+    @staticmethod
+    def _analyze_city_data(
+        city_data: pd.DataFrame,
+        city: str,
+        window: int = ROLLING_WINDOW,
+        threshold: float = ANOMALY_THRESHOLD
+    ) -> TemperatureAnalysis:
+        """Анализ данных одного города, отсортированных по дате.
+
+        Args:
+            city_data: Данные города
+            city: Название города
+            window: Окно скользящего среднего (дней)
+            threshold: Порог аномалии в стандартных отклонениях сезона
 
+        Returns:
+            TemperatureAnalysis: Результаты анализа
+        """
         # Вычисление скользящего среднего
         city_data['rolling_mean'] = city_data['temperature'].rolling(
-            window=ROLLING_WINDOW,
+            window=window,
             center=True
         ).mean()
 
@@ -57,9 +113,9 @@ class AnalysisService:
             season_mask = city_data['season'] == season
             city_data.loc[season_mask, 'is_anomaly'] = (
                 (city_data.loc[season_mask, 'temperature'] >
-                 mean + ANOMALY_THRESHOLD * std) |
+                 mean + threshold * std) |
                 (city_data.loc[season_mask, 'temperature'] <
-                 mean - ANOMALY_THRESHOLD * std)
+                 mean - threshold * std)
             )
 
         return TemperatureAnalysis(
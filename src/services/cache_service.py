@@ -0,0 +1,234 @@
+"""Кэш производных данных набора на диске.
+
+Климатология и колоночное хранилище строятся по полной истории и
+хранятся в подкаталогах, имя которых определяется отпечатком
+содержимого набора данных. Модуль содержит общие для них операции:
+вычисление отпечатка, атомарную запись каталога, загрузку или
+построение, удаление давно не использованных каталогов и манифест
+источников, по которому кэш находится без чтения самих данных.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from src.config import CACHE_MAX_DATASETS, SOURCE_MANIFEST
+from src.core.logger import logger
+
+T = TypeVar('T')
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """Отпечаток содержимого набора данных для проверки актуальности кэша.
+
+    Хэшируются значения city, timestamp, temperature и season каждой
+    строки. Хэши строк сортируются, поэтому порядок строк на отпечаток
+    не влияет, а любое изменение значений — влияет.
+    """
+    columns = pd.DataFrame({
+        'city': df['city'].astype(str),
+        'timestamp': pd.to_datetime(df['timestamp']).astype('datetime64[ns]'),
+        'temperature': df['temperature'].astype(np.float64),
+        'season': (
+            df['season'].astype(str) if 'season' in df
+            else pd.Series('', index=df.index)
+        )
+    })
+    rows = pd.util.hash_pandas_object(columns, index=False).to_numpy()
+    return hashlib.sha256(np.sort(rows).tobytes()).hexdigest()
+
+
+@contextmanager
+def atomic_directory(directory: Path) -> Iterator[Path]:
+    """Запись каталога через временный каталог и переименование.
+
+    Файлы записываются во временный каталог рядом с целевым, который
+    после успешной записи подменяет целевой. Файлы, уже открытые
+    другими процессами через memory-map, не перезаписываются: старый
+    каталог удаляется, но его данные остаются доступны до закрытия.
+
+    Args:
+        directory: Целевой каталог
+
+    Yields:
+        Path: Временный каталог для записи файлов
+    """
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(
+        prefix=f".{directory.name}.tmp-", dir=directory.parent
+    ))
+    try:
+        yield tmp
+        stale = None
+        if directory.exists():
+            stale = directory.with_name(
+                f".{directory.name}.old-{uuid.uuid4().hex}"
+            )
+            os.rename(directory, stale)
+        try:
+            os.rename(tmp, directory)
+        except OSError:
+            # Каталог уже создан параллельной сборкой
+            if not directory.exists():
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+        if stale is not None:
+            shutil.rmtree(stale, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def evict(root: Path, keep: int = CACHE_MAX_DATASETS) -> None:
+    """Удаление давно не использованных каталогов наборов данных.
+
+    Время изменения каталога обновляется при каждом открытии, поэтому
+    сохраняются keep последних использованных наборов. Процессы,
+    открывшие удаленные файлы через memory-map, продолжают работать
+    до их закрытия.
+
+    Args:
+        root: Корневой каталог кэша
+        keep: Количество сохраняемых наборов данных
+    """
+    if not root.exists():
+        return
+    entries = sorted(
+        (
+            path for path in root.iterdir()
+            if path.is_dir() and not path.name.startswith('.')
+        ),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+        logger.info(f"Удален неиспользуемый кэш {path}")
+
+
+def open_cached(
+    root: Path,
+    load: Callable[[Path], Optional[T]],
+    fingerprint: str
+) -> Optional[T]:
+    """Открытие кэша набора данных по отпечатку.
+
+    Args:
+        root: Корневой каталог кэша
+        load: Открытие кэша из каталога; None, если его нет
+        fingerprint: Отпечаток набора данных
+
+    Returns:
+        Optional[T]: Кэш или None, если он отсутствует или устарел
+    """
+    target = root / fingerprint[:16]
+    cached = load(target)
+    if cached is None or cached.fingerprint != fingerprint:
+        return None
+    # Время изменения каталога — время последнего использования для evict
+    os.utime(target)
+    logger.info(f"Кэш открыт из {target}")
+    return cached
+
+
+def load_or_build(
+    root: Path,
+    df: pd.DataFrame,
+    load: Callable[[Path], Optional[T]],
+    write: Callable[[Path, str], None],
+    fingerprint: Optional[str] = None
+) -> T:
+    """Загрузка кэша набора данных или его построение.
+
+    Каждый набор данных хранится в подкаталоге root, имя которого
+    определяется отпечатком содержимого данных. После построения
+    удаляются давно не использованные наборы.
+
+    Args:
+        root: Корневой каталог кэша
+        df: DataFrame с историческими данными
+        load: Открытие кэша из каталога; None, если его нет
+        write: Запись кэша по df в каталог с заданным отпечатком
+        fingerprint: Отпечаток df, если он уже вычислен
+
+    Returns:
+        Загруженный или построенный кэш
+    """
+    if fingerprint is None:
+        fingerprint = dataset_fingerprint(df)
+    cached = open_cached(root, load, fingerprint)
+    if cached is not None:
+        return cached
+
+    target = root / fingerprint[:16]
+    write(target, fingerprint)
+    evict(root)
+    return load(target)
+
+
+def _source_signature(source: Path) -> dict:
+    """Размер и время изменения файла или всех файлов каталога."""
+    files = [source] if source.is_file() else [
+        path for path in source.rglob('*') if path.is_file()
+    ]
+    stats = [path.stat() for path in files]
+    return {
+        'files': len(stats),
+        'size': sum(stat.st_size for stat in stats),
+        'mtime_ns': max((stat.st_mtime_ns for stat in stats), default=0)
+    }
+
+
+def _read_manifest(manifest: Path) -> dict:
+    """Записи манифеста источников: путь → подпись и отпечаток."""
+    if not manifest.exists():
+        return {}
+    with open(manifest, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def source_fingerprint(
+    source,
+    manifest: Path = SOURCE_MANIFEST
+) -> Optional[str]:
+    """Отпечаток источника по манифесту без чтения данных.
+
+    Returns:
+        Optional[str]: Отпечаток, если источник не изменялся с момента
+            его записи в манифест, иначе None
+    """
+    source = Path(source)
+    if not source.exists():
+        return None
+    entry = _read_manifest(manifest).get(str(source.resolve()))
+    if entry is None or entry['signature'] != _source_signature(source):
+        return None
+    return entry['fingerprint']
+
+
+def remember_source(
+    source,
+    fingerprint: str,
+    manifest: Path = SOURCE_MANIFEST
+) -> None:
+    """Запись отпечатка источника в манифест."""
+    source = Path(source)
+    entries = _read_manifest(manifest)
+    entries[str(source.resolve())] = {
+        'signature': _source_signature(source),
+        'fingerprint': fingerprint
+    }
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest.with_name(f".{manifest.name}.{uuid.uuid4().hex}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False)
+    tmp_path.replace(manifest)
@@ -0,0 +1,310 @@
+"""Сервис климатологии по дням года.
+
+Для каждого города рассчитываются сглаженные среднее и стандартное
+отклонение температуры для каждого из 366 дней года. Таблица строится
+один раз, сохраняется на диск в формате .npy и далее открывается через
+memory-map, поэтому поиск нормы по (город, дата) выполняется за O(1).
+"""
+
+import calendar
+import json
+from datetime import date as date_type
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    ANOMALY_THRESHOLD,
+    CLIMATOLOGY_DIR,
+    CLIMATOLOGY_SMOOTHING_WINDOW
+)
+from src.services.cache_service import (
+    atomic_directory,
+    dataset_fingerprint,
+    load_or_build
+)
+from src.core.logger import logger
+
+DAYS_IN_YEAR = 366
+# Индекс 29 февраля в календаре високосного года (0-based)
+FEB_29_INDEX = 59
+
+MEAN_FILE = "mean.npy"
+STD_FILE = "std.npy"
+META_FILE = "meta.json"
+
+
+def day_of_year_index(timestamps) -> np.ndarray:
+    """Индекс дня года в календаре високосного года (0..365).
+
+    В невисокосные годы дни после 28 февраля сдвигаются на единицу,
+    чтобы одна и та же календарная дата всегда имела один индекс.
+
+    Args:
+        timestamps: Последовательность дат
+
+    Returns:
+        np.ndarray: Массив индексов дней года
+    """
+    ts = pd.DatetimeIndex(timestamps)
+    doy = ts.dayofyear.to_numpy() - 1
+    shift = (~ts.is_leap_year) & (doy >= FEB_29_INDEX)
+    return doy + shift.astype(doy.dtype)
+
+
+def _day_of_year_index_scalar(day: date_type) -> int:
+    """Индекс дня года для одной даты (без создания pandas-объектов)."""
+    doy = day.timetuple().tm_yday - 1
+    if not calendar.isleap(day.year) and doy >= FEB_29_INDEX:
+        doy += 1
+    return doy
+
+
+def _circular_window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Сумма по скользящему окну вдоль дней года с переходом через год."""
+    half = window // 2
+    # Срез по явной границе: при half == 0 (окно 1) padding пустой
+    n_days = values.shape[1]
+    padded = np.concatenate(
+        [values[:, n_days - half:], values, values[:, :half]],
+        axis=1
+    )
+    cumsum = np.cumsum(padded, axis=1)
+    cumsum = np.concatenate(
+        [np.zeros((values.shape[0], 1)), cumsum],
+        axis=1
+    )
+    return cumsum[:, window:] - cumsum[:, :-window]
+
+
+class ClimatologyIndex:
+    """Таблица климатических норм город × день года."""
+
+    def __init__(
+        self,
+        cities: List[str],
+        mean: np.ndarray,
+        std: np.ndarray,
+        fingerprint: str = "",
+        directory: Optional[Path] = None
+    ):
+        self.cities = list(cities)
+        self.mean = mean
+        self.std = std
+        self.fingerprint = fingerprint
+        self.directory = directory
+        self._city_index: Dict[str, int] = {
+            city: i for i, city in enumerate(self.cities)
+        }
+
+    def __contains__(self, city: str) -> bool:
+        return city in self._city_index
+
+    def lookup(self, city: str, day: date_type) -> Tuple[float, float]:
+        """Климатическая норма для города на заданную дату.
+
+        Args:
+            city: Название города
+            day: Дата (date, datetime или pd.Timestamp)
+
+        Returns:
+            Tuple[float, float]: Среднее и стандартное отклонение
+        """
+        if city not in self._city_index:
+            raise KeyError(f"Город {city} отсутствует в климатологии")
+        row = self._city_index[city]
+        col = _day_of_year_index_scalar(day)
+        return float(self.mean[row, col]), float(self.std[row, col])
+
+    def is_anomaly(
+        self,
+        city: str,
+        day: date_type,
+        temperature: float,
+        threshold: float = ANOMALY_THRESHOLD
+    ) -> bool:
+        """Проверка, выходит ли температура за пределы нормы ± threshold·σ."""
+        mean, std = self.lookup(city, day)
+        return abs(temperature - mean) > threshold * std
+
+    def score(
+        self,
+        cities,
+        timestamps,
+        temperatures,
+        threshold: float = ANOMALY_THRESHOLD
+    ) -> np.ndarray:
+        """Пакетная проверка показаний на аномальность.
+
+        Показания для городов, отсутствующих в таблице, считаются
+        нормальными.
+
+        Args:
+            cities: Названия городов
+            timestamps: Даты показаний
+            temperatures: Температуры
+            threshold: Порог в стандартных отклонениях
+
+        Returns:
+            np.ndarray: Булев массив признаков аномалии
+        """
+        rows = pd.Series(cities).map(self._city_index)
+        known = rows.notna().to_numpy()
+        rows = rows.fillna(0).to_numpy(dtype=np.int64)
+        cols = day_of_year_index(timestamps)
+        temps = np.asarray(temperatures, dtype=float)
+
+        mean = self.mean[rows, cols]
+        std = self.std[rows, cols]
+        return known & (np.abs(temps - mean) > threshold * std)
+
+    def score_readings(
+        self,
+        readings: pd.DataFrame,
+        threshold: float = ANOMALY_THRESHOLD
+    ) -> pd.Series:
+        """Пакетная проверка DataFrame с колонками city/timestamp/temperature."""
+        flags = self.score(
+            readings['city'],
+            readings['timestamp'],
+            readings['temperature'],
+            threshold
+        )
+        return pd.Series(flags, index=readings.index, name='is_anomaly')
+
+
+class ClimatologyService:
+    """Сервис построения и хранения климатологии по дням года."""
+
+    @staticmethod
+    def build(
+        df: pd.DataFrame,
+        window: int = CLIMATOLOGY_SMOOTHING_WINDOW,
+        fingerprint: Optional[str] = None
+    ) -> ClimatologyIndex:
+        """Построение климатологии по историческим данным.
+
+        Статистики по каждому дню года объединяются с соседними днями
+        в пределах окна сглаживания, после чего из сумм вычисляются
+        среднее и стандартное отклонение.
+
+        Args:
+            df: DataFrame с колонками city, timestamp, temperature
+            window: Ширина окна сглаживания в днях (нечетная)
+            fingerprint: Отпечаток df, если он уже вычислен
+
+        Returns:
+            ClimatologyIndex: Таблица климатических норм
+        """
+        if window < 1 or window % 2 == 0:
+            raise ValueError(
+                "Окно сглаживания должно быть положительным и нечетным"
+            )
+
+        codes, cities = pd.factorize(df['city'], sort=True)
+        n_cities = len(cities)
+        doy = day_of_year_index(df['timestamp'])
+        temps = df['temperature'].to_numpy(dtype=float)
+
+        # Центрируем по среднему города для численной устойчивости
+        city_mean = (
+            np.bincount(codes, weights=temps, minlength=n_cities) /
+            np.bincount(codes, minlength=n_cities)
+        )
+        centered = temps - city_mean[codes]
+
+        flat = codes * DAYS_IN_YEAR + doy
+        size = n_cities * DAYS_IN_YEAR
+        shape = (n_cities, DAYS_IN_YEAR)
+        count = np.bincount(flat, minlength=size).reshape(shape)
+        total = np.bincount(flat, weights=centered, minlength=size)
+        total_sq = np.bincount(flat, weights=centered ** 2, minlength=size)
+
+        count = _circular_window_sum(count.astype(float), window)
+        total = _circular_window_sum(total.reshape(shape), window)
+        total_sq = _circular_window_sum(total_sq.reshape(shape), window)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            var = (total_sq - total * mean) / (count - 1)
+        std = np.sqrt(np.clip(var, 0, None))
+        mean = mean + city_mean[:, None]
+        std[count < 2] = np.nan
+
+        logger.info(
+            f"Построена климатология: {n_cities} городов, окно {window} дней"
+        )
+        return ClimatologyIndex(
+            cities=list(map(str, cities)),
+            mean=mean,
+            std=std,
+            fingerprint=fingerprint or dataset_fingerprint(df)
+        )
+
+    @staticmethod
+    def save(index: ClimatologyIndex, directory: Path = CLIMATOLOGY_DIR):
+        """Сохранение климатологии на диск с атомарной заменой каталога."""
+        with atomic_directory(directory) as tmp:
+            np.save(tmp / MEAN_FILE, np.ascontiguousarray(index.mean))
+            np.save(tmp / STD_FILE, np.ascontiguousarray(index.std))
+            with open(tmp / META_FILE, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'cities': index.cities, 'fingerprint': index.fingerprint},
+                    f,
+                    ensure_ascii=False
+                )
+        logger.info(f"Климатология сохранена в {directory}")
+
+    @staticmethod
+    def load(directory: Path = CLIMATOLOGY_DIR) -> Optional[ClimatologyIndex]:
+        """Загрузка климатологии с диска в режиме memory-map.
+
+        Returns:
+            Optional[ClimatologyIndex]: Таблица норм или None, если ее нет
+        """
+        meta_path = directory / META_FILE
+        if not meta_path.exists():
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        return ClimatologyIndex(
+            cities=meta['cities'],
+            mean=np.load(directory / MEAN_FILE, mmap_mode='r'),
+            std=np.load(directory / STD_FILE, mmap_mode='r'),
+            fingerprint=meta['fingerprint'],
+            directory=directory
+        )
+
+    @staticmethod
+    def load_or_build(
+        df: pd.DataFrame,
+        directory: Path = CLIMATOLOGY_DIR,
+        fingerprint: Optional[str] = None
+    ) -> ClimatologyIndex:
+        """Загрузка сохраненной климатологии или ее построение.
+
+        Каждый набор данных хранится в отдельном подкаталоге, имя которого
+        определяется отпечатком содержимого данных. Каталог записывается
+        атомарно, поэтому уже открытые через memory-map файлы никогда
+        не перезаписываются.
+
+        Args:
+            df: DataFrame с историческими данными
+            directory: Каталог хранения климатологии
+            fingerprint: Отпечаток df, если он уже вычислен
+
+        Returns:
+            ClimatologyIndex: Таблица климатических норм
+        """
+        return load_or_build(
+            directory,
+            df,
+            ClimatologyService.load,
+            lambda target, fingerprint: ClimatologyService.save(
+                ClimatologyService.build(df, fingerprint=fingerprint),
+                target
+            ),
+            fingerprint
+        )
@@ -0,0 +1,189 @@
+"""Сравнительный анализ городов.
+
+По результатам анализа всех городов один раз строится матрица
+город × дата с температурами и признаками аномалий. Рейтинги,
+сезонные средние, корреляции и совместные аномалии вычисляются по
+этой матрице векторно, без циклов по городам.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.services.analysis_service import TemperatureAnalysis
+from src.core.logger import logger
+
+
+@dataclass
+class CityComparison:
+    """Матрицы город × дата для сравнительного анализа."""
+    cities: List[str]
+    dates: pd.DatetimeIndex
+    temperature: np.ndarray
+    anomaly: np.ndarray
+    seasons: np.ndarray
+
+    @property
+    def observed(self) -> np.ndarray:
+        """Маска наличия наблюдения для (город, дата)."""
+        return ~np.isnan(self.temperature)
+
+    def anomaly_ranking(self) -> pd.DataFrame:
+        """Рейтинг городов по доле аномальных дней."""
+        days = self.observed.sum(axis=1)
+        anomalies = self.anomaly.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = anomalies / days
+        return pd.DataFrame(
+            {
+                'days': days,
+                'anomalies': anomalies,
+                'anomaly_rate': rate.round(4)
+            },
+            index=pd.Index(self.cities, name='city')
+        ).sort_values('anomaly_rate', ascending=False)
+
+    def seasonal_means(self) -> pd.DataFrame:
+        """Средняя температура город × сезон."""
+        result = {}
+        for season in np.unique(self.seasons):
+            columns = self.seasons == season
+            values = self.temperature[:, columns]
+            counts = (~np.isnan(values)).sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[season] = np.nansum(values, axis=1) / counts
+        return pd.DataFrame(
+            result,
+            index=pd.Index(self.cities, name='city')
+        ).round(2)
+
+    def correlation(self, deseasonalize: bool = True) -> pd.DataFrame:
+        """Матрица корреляций Пирсона между городами.
+
+        Корреляция считается по общим для каждой пары датам.
+
+        Args:
+            deseasonalize: Вычитать из температуры среднее города
+                по сезону, чтобы общий сезонный ход не завышал
+                корреляцию городов одного полушария
+
+        Returns:
+            pd.DataFrame: Матрица корреляций город × город
+        """
+        values = self.temperature
+        if deseasonalize:
+            values = values.copy()
+            for season in np.unique(self.seasons):
+                columns = self.seasons == season
+                with np.errstate(invalid='ignore'):
+                    means = np.nanmean(values[:, columns], axis=1)
+                values[:, columns] -= means[:, None]
+
+        valid = (~np.isnan(values)).astype(float)
+        x = np.nan_to_num(values)
+        n = valid @ valid.T
+        sx = x @ valid.T
+        sxx = (x * x) @ valid.T
+        sxy = x @ x.T
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = n * sxy - sx * sx.T
+            var = n * sxx - sx * sx
+            corr = cov / np.sqrt(var * var.T)
+        return pd.DataFrame(
+            corr.round(3),
+            index=pd.Index(self.cities, name='city'),
+            columns=self.cities
+        )
+
+    def co_occurrence(self) -> pd.DataFrame:
+        """Количество дней с одновременными аномалиями для пар городов.
+
+        На диагонали — общее количество аномалий города.
+        """
+        anomaly = self.anomaly.astype(np.int32)
+        return pd.DataFrame(
+            anomaly @ anomaly.T,
+            index=pd.Index(self.cities, name='city'),
+            columns=self.cities
+        )
+
+    def simultaneous_anomalies(self, min_cities: int = 2) -> pd.DataFrame:
+        """Даты, когда аномалии наблюдались сразу в нескольких городах.
+
+        Args:
+            min_cities: Минимальное количество городов с аномалией
+
+        Returns:
+            pd.DataFrame: Даты, число и список городов с аномалией
+        """
+        counts = self.anomaly.sum(axis=0)
+        columns = np.flatnonzero(counts >= min_cities)
+        cities = np.array(self.cities, dtype=object)
+        return pd.DataFrame({
+            'timestamp': self.dates[columns],
+            'cities_count': counts[columns],
+            'cities': [
+                ', '.join(cities[self.anomaly[:, column]])
+                for column in columns
+            ]
+        }).sort_values(
+            ['cities_count', 'timestamp'],
+            ascending=[False, True]
+        ).reset_index(drop=True)
+
+
+class ComparisonService:
+    """Сервис построения матриц для сравнения городов."""
+
+    @staticmethod
+    def build(df: pd.DataFrame) -> CityComparison:
+        """Построение матриц город × дата за один проход.
+
+        Args:
+            df: DataFrame с колонками city, timestamp, temperature,
+                season и is_anomaly
+
+        Returns:
+            CityComparison: Матрицы температур и аномалий
+        """
+        city_codes, cities = pd.factorize(df['city'], sort=True)
+        date_codes, dates = pd.factorize(df['timestamp'], sort=True)
+        shape = (len(cities), len(dates))
+
+        temperature = np.full(shape, np.nan)
+        temperature[city_codes, date_codes] = df['temperature'].to_numpy()
+        anomaly = np.zeros(shape, dtype=bool)
+        anomaly[city_codes, date_codes] = (
+            df['is_anomaly'].to_numpy(dtype=bool)
+        )
+
+        # Сезон определяется датой, поэтому хранится одна строка на все города
+        seasons = np.empty(len(dates), dtype=object)
+        seasons[date_codes] = df['season'].astype(str).to_numpy()
+
+        logger.info(
+            f"Построена матрица сравнения: {shape[0]} городов × "
+            f"{shape[1]} дат"
+        )
+        return CityComparison(
+            cities=list(map(str, cities)),
+            dates=pd.DatetimeIndex(dates),
+            temperature=temperature,
+            anomaly=anomaly,
+            seasons=seasons
+        )
+
+    @staticmethod
+    def build_from_analyses(
+        analyses: Dict[str, TemperatureAnalysis]
+    ) -> CityComparison:
+        """Построение матриц по результатам анализа городов."""
+        return ComparisonService.build(
+            pd.concat(
+                [analysis.data for analysis in analyses.values()],
+                ignore_index=True
+            )
+        )
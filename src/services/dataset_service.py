@@ -0,0 +1,109 @@
+"""Открытие хранилища и климатологии набора данных.
+
+Хранилище и климатология строятся по полной истории с одним
+отпечатком содержимого. Для файлов и каталогов отпечаток запоминается
+в манифесте источников вместе с размером и временем изменения, поэтому
+при следующих запусках оба кэша открываются без чтения исходных данных.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+from src.config import CLIMATOLOGY_DIR, STORE_DIR
+from src.services.cache_service import (
+    dataset_fingerprint,
+    open_cached,
+    remember_source,
+    source_fingerprint
+)
+from src.services.climatology_service import (
+    ClimatologyIndex,
+    ClimatologyService
+)
+from src.services.query_service import QueryService
+from src.services.storage_service import HistoryStore, HistoryStoreService
+from src.core.logger import logger
+
+
+@dataclass
+class Dataset:
+    """Производные данные одного набора."""
+    store: HistoryStore
+    climatology: ClimatologyIndex
+
+    @property
+    def fingerprint(self) -> str:
+        """Отпечаток содержимого набора данных."""
+        return self.store.fingerprint
+
+
+class DatasetService:
+    """Сервис открытия и построения производных данных набора."""
+
+    @staticmethod
+    def from_frame(df: pd.DataFrame, source=None) -> Dataset:
+        """Хранилище и климатология для DataFrame с полной историей.
+
+        Отпечаток вычисляется один раз и передается обоим сервисам.
+
+        Args:
+            df: DataFrame с историческими данными
+            source: Путь к исходным данным для записи в манифест
+
+        Returns:
+            Dataset: Открытые хранилище и климатология
+        """
+        fingerprint = dataset_fingerprint(df)
+        dataset = Dataset(
+            store=HistoryStoreService.load_or_build(
+                df, fingerprint=fingerprint
+            ),
+            climatology=ClimatologyService.load_or_build(
+                df, fingerprint=fingerprint
+            )
+        )
+        if source is not None:
+            remember_source(source, fingerprint)
+        return dataset
+
+    @staticmethod
+    def open_source(source) -> Optional[Dataset]:
+        """Открытие уже построенных данных без чтения источника.
+
+        Args:
+            source: Путь к CSV или Parquet
+
+        Returns:
+            Optional[Dataset]: Данные набора или None, если источник
+                изменился или кэш еще не построен
+        """
+        fingerprint = source_fingerprint(source)
+        if fingerprint is None:
+            return None
+        store = open_cached(STORE_DIR, HistoryStoreService.open, fingerprint)
+        climatology = open_cached(
+            CLIMATOLOGY_DIR, ClimatologyService.load, fingerprint
+        )
+        if store is None or climatology is None:
+            return None
+        return Dataset(store=store, climatology=climatology)
+
+    @staticmethod
+    def load_or_build(source) -> Dataset:
+        """Открытие данных набора или их построение по полной истории.
+
+        Источник читается целиком только при построении.
+
+        Args:
+            source: Путь к CSV или Parquet
+
+        Returns:
+            Dataset: Открытые хранилище и климатология
+        """
+        dataset = DatasetService.open_source(source)
+        if dataset is not None:
+            return dataset
+        logger.info(f"Построение хранилища и климатологии для {source}")
+        return DatasetService.from_frame(QueryService.read(source), source)
@@ -0,0 +1,255 @@
+"""Генератор синтетических температурных данных.
+
+Создает наборы данных со схемой city,timestamp,temperature,season
+произвольного размера. Температура моделируется как сезонная синусоида
+с шумом, в которую с заданной частотой добавляются аномальные
+отклонения. Внедренные аномалии записываются в отдельный файл и служат
+эталоном для проверки корректности алгоритмов поиска аномалий.
+
+Данные генерируются и записываются частями, поэтому объем памяти не
+зависит от итогового количества строк.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import GENERATOR_CHUNK_ROWS, MONTH_TO_SEASON
+from src.core.logger import logger
+
+SEASONS = ['winter', 'spring', 'summer', 'autumn']
+# Диапазоны годовой амплитуды температуры (°C) для профилей сезонности
+SEASONAL_PROFILES = {
+    'continental': (10.0, 16.0),
+    'temperate': (5.0, 10.0),
+    'tropical': (0.5, 3.0),
+    'mixed': (0.5, 16.0)
+}
+# Доля городов южного полушария (сезонный ход в противофазе)
+SOUTHERN_SHARE = 0.3
+# День года с максимальной температурой в северном полушарии
+NORTHERN_PEAK_DAY = 200
+
+
+@dataclass
+class GeneratorConfig:
+    """Параметры генерации синтетического набора данных."""
+    n_cities: int = 15
+    years: int = 10
+    start_year: int = 2010
+    profile: str = 'mixed'
+    noise: float = 3.0
+    anomaly_rate: float = 0.01
+    anomaly_sigma: float = 5.0
+    seed: int = 42
+
+    def __post_init__(self):
+        if self.profile not in SEASONAL_PROFILES:
+            raise ValueError(
+                f"Неизвестный профиль сезонности: {self.profile}. "
+                f"Допустимые значения: {set(SEASONAL_PROFILES)}"
+            )
+
+
+@dataclass
+class GeneratedDataset:
+    """Результат генерации."""
+    path: Path
+    truth_path: Path
+    rows: int
+    anomalies: int
+
+
+class _ChunkWriter:
+    """Потоковая запись частей в CSV или Parquet."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.is_parquet = path.suffix == '.parquet'
+        self._writer = None
+        self._header = True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+            import pyarrow.parquet as pq
+        except ImportError:
+            pa = pa_csv = pq = None
+            if self.is_parquet:
+                raise ImportError(
+                    "Для записи Parquet необходимо установить pyarrow"
+                )
+        self._pa, self._pa_csv, self._pq = pa, pa_csv, pq
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.is_parquet:
+            # Метаданные pandas и ширина индексов категорий различаются
+            # между частями, поэтому части приводятся к схеме первой
+            table = self._pa.Table.from_pandas(
+                df, preserve_index=False
+            ).replace_schema_metadata(None)
+            if self._writer is None:
+                self._writer = self._pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = table.cast(self._writer.schema)
+            # Каждая часть — отдельная row-группа со своими статистиками
+            self._writer.write_table(table)
+            return
+
+        df = df.assign(timestamp=df['timestamp'].dt.strftime('%Y-%m-%d'))
+        if self._pa_csv is not None:
+            table = self._pa.Table.from_pandas(df, preserve_index=False)
+            with open(self.path, 'ab') as f:
+                if self._header:
+                    f.write((','.join(df.columns) + '\n').encode())
+                self._pa_csv.write_csv(
+                    table,
+                    f,
+                    self._pa_csv.WriteOptions(
+                        include_header=False,
+                        quoting_style='none'
+                    )
+                )
+        else:
+            df.to_csv(self.path, mode='a', header=self._header, index=False)
+        self._header = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class GeneratorService:
+    """Сервис генерации синтетических температурных данных."""
+
+    @staticmethod
+    def generate(
+        config: GeneratorConfig,
+        output: Path,
+        chunk_rows: int = GENERATOR_CHUNK_ROWS,
+        truth_output: Optional[Path] = None
+    ) -> GeneratedDataset:
+        """Генерация набора данных с потоковой записью.
+
+        Args:
+            config: Параметры генерации
+            output: Файл .csv или .parquet для данных
+            chunk_rows: Приблизительное число строк в одной части
+            truth_output: Файл для эталонных аномалий. По умолчанию
+                рядом с output с суффиксом .anomalies
+
+        Returns:
+            GeneratedDataset: Пути к файлам и количество строк
+        """
+        rng = np.random.default_rng(config.seed)
+        truth_output = truth_output or output.with_name(
+            f"{output.stem}.anomalies{output.suffix}"
+        )
+
+        days = pd.date_range(
+            f"{config.start_year}-01-01",
+            f"{config.start_year + config.years - 1}-12-31",
+            freq='D'
+        )
+        n_days = len(days)
+        day_of_year = days.dayofyear.to_numpy()
+        season_codes = np.array(
+            [SEASONS.index(MONTH_TO_SEASON[m]) for m in range(1, 13)],
+            dtype=np.int8
+        )[days.month.to_numpy() - 1]
+
+        # Параметры городов: средняя температура, амплитуда, полушарие
+        low, high = SEASONAL_PROFILES[config.profile]
+        base = rng.uniform(-5.0, 28.0, config.n_cities)
+        amplitude = rng.uniform(low, high, config.n_cities)
+        southern = rng.random(config.n_cities) < SOUTHERN_SHARE
+        peak = np.where(southern, NORTHERN_PEAK_DAY - 182, NORTHERN_PEAK_DAY)
+        city_names = np.array(
+            [f"City_{i:05d}" for i in range(config.n_cities)],
+            dtype=object
+        )
+
+        cities_per_chunk = max(1, chunk_rows // n_days)
+        writer = _ChunkWriter(output)
+        truth_writer = _ChunkWriter(truth_output)
+        rows = anomalies = 0
+        completed = False
+
+        try:
+            for first in range(0, config.n_cities, cities_per_chunk):
+                block = slice(
+                    first, min(first + cities_per_chunk, config.n_cities)
+                )
+                n_block = block.stop - block.start
+
+                phase = 2 * np.pi * (
+                    day_of_year[None, :] - peak[block, None]
+                ) / 365.25
+                temperature = (
+                    base[block, None] +
+                    amplitude[block, None] * np.cos(phase) +
+                    config.noise * rng.standard_normal((n_block, n_days))
+                )
+
+                # Внедрение аномалий известного размера
+                is_anomaly = rng.random((n_block, n_days)) < config.anomaly_rate
+                n_anomalies = int(is_anomaly.sum())
+                offsets = (
+                    rng.choice([-1.0, 1.0], n_anomalies) *
+                    rng.uniform(1.0, 1.5, n_anomalies) *
+                    config.anomaly_sigma * config.noise
+                )
+                temperature[is_anomaly] += offsets
+
+                city_codes = np.repeat(np.arange(n_block), n_days)
+                chunk = pd.DataFrame({
+                    'city': pd.Categorical.from_codes(
+                        city_codes, city_names[block]
+                    ),
+                    'timestamp': np.tile(days.to_numpy(), n_block),
+                    'temperature': temperature.ravel(),
+                    'season': pd.Categorical.from_codes(
+                        np.tile(season_codes, n_block), SEASONS
+                    )
+                })
+                writer.write(chunk)
+
+                # Явные типы: часть без аномалий сохраняет схему файла
+                flat_anomaly = is_anomaly.ravel()
+                truth_writer.write(pd.DataFrame({
+                    'city': pd.array(
+                        chunk['city'][flat_anomaly].to_numpy(), dtype=str
+                    ),
+                    'timestamp': chunk['timestamp'][flat_anomaly].to_numpy(
+                        dtype='datetime64[ns]'
+                    ),
+                    'offset': offsets.astype(np.float64)
+                }))
+
+                rows += len(chunk)
+                anomalies += n_anomalies
+                logger.debug(f"Сгенерировано строк: {rows}")
+            completed = True
+        finally:
+            writer.close()
+            truth_writer.close()
+            if not completed:
+                # Частично записанные файлы не оставляются
+                output.unlink(missing_ok=True)
+                truth_output.unlink(missing_ok=True)
+
+        logger.info(
+            f"Сгенерировано {rows} строк ({config.n_cities} городов, "
+            f"{config.years} лет), аномалий: {anomalies} → {output}"
+        )
+        return GeneratedDataset(
+            path=output,
+            truth_path=truth_output,
+            rows=rows,
+            anomalies=anomalies
+        )
@@ -0,0 +1,336 @@
+"""Массовая загрузка показаний температуры из OpenWeatherMap API.
+
+Опрос выполняется раундами: в каждом раунде запрашивается текущая
+температура для всех городов через ограниченный асинхронный конвейер
+(очередь городов → пул исполнителей → запись пакетами). Показания
+накапливаются и записываются на диск пакетами в Parquet или CSV.
+После каждой записи обновляется контрольная точка, поэтому прерванный
+запуск продолжается с места остановки.
+"""
+
+import asyncio
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import aiohttp
+import pandas as pd
+
+from src.config import (
+    INGEST_BATCH_SIZE,
+    INGEST_CONCURRENCY,
+    INGEST_RETRIES,
+    MONTH_TO_SEASON,
+    OPENWEATHER_API_BASE_URL
+)
+from src.services.climatology_service import ClimatologyIndex
+from src.services.rollup_service import RollupService
+from src.core.logger import logger
+
+# Признак завершения работы исполнителя в очереди результатов
+_WORKER_DONE = object()
+
+
+@dataclass
+class IngestionCheckpoint:
+    """Прогресс загрузки: завершенные раунды и города текущего раунда."""
+    completed_rounds: int = 0
+    done: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        """Прогресс для сравнения контрольных точек одного запуска."""
+        return self.completed_rounds, len(self.done)
+
+    @staticmethod
+    def load(path: Path) -> 'IngestionCheckpoint':
+        """Загрузка контрольной точки или создание новой."""
+        if not path.exists():
+            return IngestionCheckpoint()
+        with open(path, encoding='utf-8') as f:
+            return IngestionCheckpoint(**json.load(f))
+
+    def save(self, path: Path) -> None:
+        """Атомарное сохранение контрольной точки."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+
+class ReadingWriter:
+    """Пакетная запись показаний в Parquet (каталог) или CSV (файл)."""
+
+    def __init__(self, output: Path):
+        self.output = output
+        self.is_csv = output.suffix == '.csv'
+        self._part = 0
+        if self.is_csv:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            return
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Для записи Parquet необходимо установить pyarrow"
+            ) from e
+        output.mkdir(parents=True, exist_ok=True)
+        # При продолжении загрузки нумерация частей не перезаписывает старые
+        self._part = len(list(output.glob('part-*.parquet')))
+
+    def write(self, rows: List[dict]) -> None:
+        """Запись пакета показаний."""
+        if not rows:
+            return
+        df = pd.DataFrame(
+            rows,
+            columns=['city', 'timestamp', 'temperature', 'season']
+        )
+        if self.is_csv:
+            df.to_csv(
+                self.output,
+                mode='a',
+                header=not self.output.exists(),
+                index=False
+            )
+        else:
+            df.to_parquet(
+                self.output / f"part-{self._part:06d}.parquet",
+                index=False
+            )
+            self._part += 1
+
+
+class IngestionService:
+    """Сервис массового опроса API и записи показаний."""
+
+    @staticmethod
+    async def _fetch_reading(
+        session: aiohttp.ClientSession,
+        base_url: str,
+        city: str,
+        api_key: str,
+        round_id: int = 0
+    ) -> Optional[dict]:
+        """Запрос текущей температуры для города с повторами.
+
+        Номер раунда передается параметром round: OpenWeatherMap его
+        игнорирует, а сервер воспроизведения по нему выбирает запись,
+        поэтому продолженная загрузка получает те же данные, что и
+        непрерывная.
+
+        Returns:
+            Optional[dict]: Показание или None, если получить его не удалось
+        """
+        params = {
+            'q': city,
+            'appid': api_key,
+            'units': 'metric',
+            'round': round_id
+        }
+        for attempt in range(1, INGEST_RETRIES + 1):
+            try:
+                async with session.get(base_url, params=params) as response:
+                    data = await response.json(content_type=None)
+                    if response.status == 200:
+                        timestamp = pd.Timestamp(
+                            data['dt'] + data.get('timezone', 0),
+                            unit='s'
+                        )
+                        return {
+                            'city': city,
+                            'timestamp': timestamp,
+                            'temperature': data['main']['temp'],
+                            'season': MONTH_TO_SEASON[timestamp.month]
+                        }
+                    if response.status in (401, 404):
+                        logger.error(
+                            f"{response.status}: {data.get('message')} "
+                            f"для {city}"
+                        )
+                        return None
+                    logger.warning(
+                        f"{response.status} для {city}, "
+                        f"попытка {attempt}/{INGEST_RETRIES}"
+                    )
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                ValueError,
+                KeyError,
+                TypeError
+            ) as e:
+                # KeyError и TypeError — ответ 200 с неполным телом
+                logger.warning(
+                    f"Ошибка запроса для {city}: {str(e)}, "
+                    f"попытка {attempt}/{INGEST_RETRIES}"
+                )
+            if attempt < INGEST_RETRIES:
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        return None
+
+    @staticmethod
+    async def _run_round(
+        session: aiohttp.ClientSession,
+        cities: List[str],
+        buffer: List[dict],
+        flush: Callable[[], None],
+        checkpoint: IngestionCheckpoint,
+        base_url: str,
+        api_key: str,
+        concurrency: int,
+        batch_size: int
+    ) -> None:
+        """Один раунд опроса через ограниченный конвейер.
+
+        Прогресс отмечается в контрольной точке в памяти сразу по получении
+        показания, а на диск она сохраняется только вместе с записью
+        пакета, поэтому сохраненное состояние всегда соответствует данным.
+        """
+        round_id = checkpoint.completed_rounds
+        cities_queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+
+        async def produce():
+            for city in cities:
+                await cities_queue.put(city)
+            for _ in range(concurrency):
+                await cities_queue.put(None)
+
+        async def fetch():
+            while (city := await cities_queue.get()) is not None:
+                reading = await IngestionService._fetch_reading(
+                    session, base_url, city, api_key, round_id
+                )
+                await results.put((city, reading))
+            await results.put(_WORKER_DONE)
+
+        async def consume():
+            finished = 0
+            while finished < concurrency:
+                item = await results.get()
+                if item is _WORKER_DONE:
+                    finished += 1
+                    continue
+                city, reading = item
+                checkpoint.done.append(city)
+                if reading is None:
+                    checkpoint.failed.append(f"{round_id}:{city}")
+                    continue
+                buffer.append(reading)
+                if len(buffer) >= batch_size:
+                    flush()
+
+        await asyncio.gather(
+            produce(),
+            *[fetch() for _ in range(concurrency)],
+            consume()
+        )
+
+    @staticmethod
+    async def run(
+        cities: List[str],
+        rounds: int,
+        output: Path,
+        checkpoint_path: Path,
+        api_key: str,
+        base_url: str = OPENWEATHER_API_BASE_URL,
+        concurrency: int = INGEST_CONCURRENCY,
+        batch_size: int = INGEST_BATCH_SIZE,
+        interval: float = 0,
+        rollups_dir: Optional[Path] = None,
+        climatology: Optional[ClimatologyIndex] = None
+    ) -> IngestionCheckpoint:
+        """Запуск массовой загрузки с продолжением по контрольной точке.
+
+        Args:
+            cities: Города для опроса
+            rounds: Общее количество раундов опроса
+            output: Каталог Parquet или файл .csv для записи
+            checkpoint_path: Путь к файлу контрольной точки
+            api_key: Ключ OpenWeatherMap API
+            base_url: Адрес API (например, локального сервера воспроизведения)
+            concurrency: Количество одновременных запросов
+            batch_size: Количество строк в одной записи на диск
+            interval: Пауза между раундами в секундах
+            rollups_dir: Каталог месячных и годовых агрегатов, которые
+                инкрементально обновляются при каждой записи пакета
+            climatology: Климатология, по которой показания оцениваются
+                на аномальность для агрегатов (нужна вместе с rollups_dir)
+
+        Returns:
+            IngestionCheckpoint: Итоговое состояние загрузки
+        """
+        checkpoint = IngestionCheckpoint.load(checkpoint_path)
+        rollups = None
+        if rollups_dir is not None:
+            if climatology is None:
+                raise ValueError(
+                    "Для агрегатов показаний необходима климатология"
+                )
+            rollups, meta = RollupService.load(rollups_dir)
+            # Агрегаты сохраняются раньше контрольной точки: если запуск
+            # прервался между ними, продолжаем с состояния агрегатов,
+            # чтобы не учесть пакет в них повторно
+            if 'checkpoint' in meta:
+                saved = IngestionCheckpoint(**meta['checkpoint'])
+                if saved.progress > checkpoint.progress:
+                    checkpoint = saved
+        if checkpoint.completed_rounds or checkpoint.done:
+            logger.info(
+                f"Продолжение загрузки: завершено раундов "
+                f"{checkpoint.completed_rounds}, городов в текущем раунде "
+                f"{len(checkpoint.done)}"
+            )
+        writer = ReadingWriter(output)
+        buffer: List[dict] = []
+
+        def flush():
+            nonlocal rollups
+            writer.write(buffer)
+            if rollups_dir is not None and buffer:
+                batch = pd.DataFrame(buffer)
+                batch['is_anomaly'] = climatology.score_readings(batch)
+                rollups = (
+                    RollupService.build(batch) if rollups is None
+                    else RollupService.update(rollups, batch)
+                )
+                # Контрольная точка записывается атомарно вместе с агрегатами
+                RollupService.save(rollups, rollups_dir, {
+                    'checkpoint': asdict(checkpoint),
+                    'climatology': climatology.fingerprint
+                })
+            checkpoint.save(checkpoint_path)
+            buffer.clear()
+
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout
+        ) as session:
+            while checkpoint.completed_rounds < rounds:
+                done = set(checkpoint.done)
+                pending = [city for city in cities if city not in done]
+                await IngestionService._run_round(
+                    session, pending, buffer, flush, checkpoint,
+                    base_url, api_key, concurrency, batch_size
+                )
+                checkpoint.completed_rounds += 1
+                checkpoint.done = []
+                logger.debug(
+                    f"Раунд {checkpoint.completed_rounds}/{rounds} завершен"
+                )
+                if interval and checkpoint.completed_rounds < rounds:
+                    # Перед паузой сохраняем накопленные показания
+                    flush()
+                    await asyncio.sleep(interval)
+            flush()
+
+        if checkpoint.failed:
+            logger.warning(f"Не получены показания: {len(checkpoint.failed)}")
+        return checkpoint
@@ -0,0 +1,213 @@
+"""Интерактивные графики с агрегацией данных на сервере.
+
+Альтернатива VisualizationService: вместо PNG-изображений клиенту
+передаются спецификации Vega-Lite (Altair) с уже агрегированными и
+прореженными данными, а отрисовка выполняется в браузере. Для
+временного ряда обзорный график позволяет выделить диапазон, после
+чего для него запрашиваются данные более детального уровня.
+"""
+
+from typing import Optional, Tuple
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from src.config import ROLLUP_MAX_POINTS, TEMPERATURE_COLORS
+from src.services.rollup_service import RollupService, TemperatureRollups
+
+# Имя параметра выделения диапазона на обзорном графике
+ZOOM_SELECTION = 'zoom'
+CHART_HEIGHT = 300
+HISTOGRAM_BINS = 40
+SEASON_ORDER = ['winter', 'spring', 'summer', 'autumn']
+
+
+class InteractiveVisualizationService:
+    """Сервис создания интерактивных графиков Altair."""
+
+    @staticmethod
+    def parse_zoom(
+        selection: dict
+    ) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """Диапазон дат из выделения на обзорном графике.
+
+        Args:
+            selection: Состояние выделения из st.altair_chart
+
+        Returns:
+            Tuple: Начало и конец диапазона или (None, None)
+        """
+        bounds = (selection or {}).get(ZOOM_SELECTION, {}).get('timestamp')
+        if not bounds:
+            return None, None
+        start, end = (
+            pd.to_datetime(value, unit='ms')
+            if isinstance(value, (int, float)) else pd.Timestamp(value)
+            for value in bounds
+        )
+        return start, end
+
+    @staticmethod
+    def time_series_data(
+        daily: pd.DataFrame,
+        rollups: TemperatureRollups,
+        city: str,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        max_points: int = ROLLUP_MAX_POINTS
+    ) -> Tuple[str, pd.DataFrame, pd.DataFrame]:
+        """Данные временного ряда для диапазона дат.
+
+        Уровень детализации выбирается так, чтобы количество точек
+        не превышало max_points. Аномалии передаются всегда по дням.
+        Если в диапазоне нет данных (узкое выделение или выделение за
+        последней датой), возвращаются пустые ряд и аномалии.
+
+        Returns:
+            Tuple: Уровень, ряд (timestamp, mean, min, max) и аномалии
+        """
+        mask = pd.Series(True, index=daily.index)
+        if start is not None:
+            mask &= daily['timestamp'] >= start
+        if end is not None:
+            mask &= daily['timestamp'] <= end
+        window = daily[mask]
+        anomalies = window.loc[
+            window['is_anomaly'].astype(bool), ['timestamp', 'temperature']
+        ]
+
+        # Ряд агрегатов обрезается до диапазона в RollupService.resolve
+        level, series = RollupService.resolve(
+            rollups, window, city, max_points
+        )
+        if level == 'daily':
+            series = series.assign(
+                min=series['temperature'],
+                max=series['temperature']
+            )
+        return level, series[['timestamp', 'mean', 'min', 'max']], anomalies
+
+    @staticmethod
+    def plot_overview(rollups: TemperatureRollups, city: str) -> alt.Chart:
+        """Обзорный график месячных средних с выделением диапазона."""
+        data = rollups.frame('monthly', city)[['timestamp', 'mean']]
+        zoom = alt.selection_interval(encodings=['x'], name=ZOOM_SELECTION)
+        return alt.Chart(data).mark_area(
+            color=TEMPERATURE_COLORS['normal'],
+            opacity=0.5
+        ).encode(
+            x=alt.X('timestamp:T', title='Дата'),
+            y=alt.Y('mean:Q', title='°C')
+        ).add_params(zoom).properties(
+            height=80,
+            title='Выделите диапазон для детализации'
+        )
+
+    @staticmethod
+    def plot_temperature_time_series(
+        level: str,
+        series: pd.DataFrame,
+        anomalies: pd.DataFrame,
+        city: str
+    ) -> alt.Chart:
+        """Временной ряд температур с диапазоном min/max и аномалиями."""
+        base = alt.Chart(series).encode(x=alt.X('timestamp:T', title='Дата'))
+        band = base.mark_area(
+            color=TEMPERATURE_COLORS['normal'],
+            opacity=0.2
+        ).encode(
+            y=alt.Y('min:Q', title='Температура (°C)'),
+            y2='max:Q'
+        )
+        line = base.mark_line(color=TEMPERATURE_COLORS['rolling']).encode(
+            y='mean:Q',
+            tooltip=['timestamp:T', 'mean:Q', 'min:Q', 'max:Q']
+        )
+        points = alt.Chart(anomalies).mark_circle(
+            color=TEMPERATURE_COLORS['anomaly'],
+            size=30
+        ).encode(
+            x='timestamp:T',
+            y='temperature:Q',
+            tooltip=['timestamp:T', 'temperature:Q']
+        )
+        return (band + line + points).properties(
+            height=CHART_HEIGHT,
+            title=f'Временной ряд температур для города {city} ({level})'
+        )
+
+    @staticmethod
+    def plot_seasonal_boxplot(data: pd.DataFrame, city: str) -> alt.Chart:
+        """Box plot по сезонам из квантилей, рассчитанных на сервере."""
+        stats = data.groupby('season', observed=True)['temperature'].quantile(
+            [0.0, 0.25, 0.5, 0.75, 1.0]
+        ).unstack()
+        stats.columns = ['min', 'q1', 'median', 'q3', 'max']
+        stats = stats.reset_index().assign(
+            season=lambda df: df['season'].astype(str)
+        )
+
+        base = alt.Chart(stats).encode(
+            x=alt.X('season:N', sort=SEASON_ORDER, title='Сезон')
+        )
+        whiskers = base.mark_rule().encode(
+            y=alt.Y('min:Q', title='Температура (°C)'),
+            y2='max:Q'
+        )
+        boxes = base.mark_bar(size=40).encode(y='q1:Q', y2='q3:Q')
+        medians = base.mark_tick(color='white', size=40).encode(y='median:Q')
+        return (whiskers + boxes + medians).properties(
+            height=CHART_HEIGHT,
+            title=f'Распределение температур по сезонам для города {city}'
+        )
+
+    @staticmethod
+    def plot_temperature_distribution(
+        data: pd.DataFrame,
+        city: str
+    ) -> alt.Chart:
+        """Гистограмма температур по сезонам с разбиением на сервере."""
+        edges = np.histogram_bin_edges(data['temperature'], HISTOGRAM_BINS)
+        counts = []
+        for season, group in data.groupby('season', observed=True):
+            hist, _ = np.histogram(group['temperature'], edges)
+            counts.append(pd.DataFrame({
+                'season': str(season),
+                'bin_start': edges[:-1],
+                'bin_end': edges[1:],
+                'count': hist
+            }))
+
+        return alt.Chart(pd.concat(counts)).mark_bar().encode(
+            x=alt.X('bin_start:Q', bin='binned', title='Температура (°C)'),
+            x2='bin_end:Q',
+            y=alt.Y('count:Q', stack=True, title='Количество дней'),
+            color=alt.Color('season:N', sort=SEASON_ORDER, title='Сезон')
+        ).properties(
+            height=CHART_HEIGHT,
+            title=f'Распределение температур для города {city}'
+        )
+
+    @staticmethod
+    def plot_anomalies_heatmap(
+        rollups: TemperatureRollups,
+        city: str
+    ) -> alt.Chart:
+        """Тепловая карта аномалий по месячным агрегатам."""
+        data = rollups.frame('monthly', city)[
+            ['year', 'month', 'anomaly_count']
+        ]
+        return alt.Chart(data).mark_rect().encode(
+            x=alt.X('month:O', title='Месяц'),
+            y=alt.Y('year:O', title='Год'),
+            color=alt.Color(
+                'anomaly_count:Q',
+                scale=alt.Scale(scheme='yelloworangered'),
+                title='Аномалии'
+            ),
+            tooltip=['year:O', 'month:O', 'anomaly_count:Q']
+        ).properties(
+            height=CHART_HEIGHT,
+            title=f'Количество аномалий по месяцам для города {city}'
+        )
@@ -0,0 +1,196 @@
+"""Загрузка исторических данных с фильтрацией на уровне чтения.
+
+Фильтры по городам, диапазону дат и сезонам применяются при чтении
+источника: CSV читается по частям, Parquet фильтруется по статистикам
+row-группам, колоночное хранилище — по индексу смещений и бинарному
+поиску по датам. В память попадают только подходящие строки.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import CSV_CHUNK_SIZE
+from src.services.storage_service import HistoryStore
+from src.core.logger import logger
+
+COLUMNS = ['city', 'timestamp', 'temperature', 'season']
+
+
+@dataclass
+class HistoryQuery:
+    """Параметры выборки исторических данных.
+
+    Пустое значение параметра означает отсутствие фильтра.
+    """
+    cities: Optional[List[str]] = None
+    start: Optional[pd.Timestamp] = None
+    end: Optional[pd.Timestamp] = None
+    seasons: Optional[List[str]] = None
+
+    def __post_init__(self):
+        if self.start is not None:
+            self.start = pd.Timestamp(self.start)
+        if self.end is not None:
+            self.end = pd.Timestamp(self.end)
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """Маска строк DataFrame, удовлетворяющих запросу."""
+        mask = pd.Series(True, index=df.index)
+        if self.cities is not None:
+            mask &= df['city'].isin(self.cities)
+        if self.seasons is not None:
+            mask &= df['season'].isin(self.seasons)
+        if self.start is not None:
+            mask &= df['timestamp'] >= self.start
+        if self.end is not None:
+            mask &= df['timestamp'] <= self.end
+        return mask
+
+
+class QueryService:
+    """Сервис чтения исторических данных с учетом фильтров."""
+
+    @staticmethod
+    def read_csv(
+        source,
+        query: Optional[HistoryQuery] = None,
+        chunksize: int = CSV_CHUNK_SIZE
+    ) -> pd.DataFrame:
+        """Чтение CSV по частям с фильтрацией каждой части.
+
+        Дешевые фильтры по городу и сезону применяются до разбора дат,
+        поэтому даты разбираются только для подходящих строк.
+
+        Args:
+            source: Путь к файлу или файловый объект
+            query: Параметры выборки
+            chunksize: Количество строк в одной части
+
+        Returns:
+            pd.DataFrame: Отфильтрованные данные
+        """
+        query = query or HistoryQuery()
+        parts = []
+        for chunk in pd.read_csv(source, chunksize=chunksize):
+            missing = set(COLUMNS) - set(chunk.columns)
+            if missing:
+                raise ValueError(
+                    f"Отсутствуют обязательные колонки: {missing}"
+                )
+            if query.cities is not None:
+                chunk = chunk[chunk['city'].isin(query.cities)]
+            if query.seasons is not None:
+                chunk = chunk[chunk['season'].isin(query.seasons)]
+            if chunk.empty:
+                continue
+            chunk = chunk.assign(timestamp=pd.to_datetime(chunk['timestamp']))
+            parts.append(chunk[query.mask(chunk)])
+
+        if not parts:
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    @staticmethod
+    def read_parquet(
+        source,
+        query: Optional[HistoryQuery] = None
+    ) -> pd.DataFrame:
+        """Чтение Parquet с передачей фильтров в pyarrow.
+
+        Row-группы, статистики которых не пересекаются с запросом,
+        не читаются.
+
+        Args:
+            source: Путь к файлу или каталогу Parquet
+            query: Параметры выборки
+
+        Returns:
+            pd.DataFrame: Отфильтрованные данные
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Для чтения Parquet необходимо установить pyarrow"
+            ) from e
+
+        query = query or HistoryQuery()
+        filters = []
+        if query.cities is not None:
+            filters.append(('city', 'in', list(query.cities)))
+        if query.seasons is not None:
+            filters.append(('season', 'in', list(query.seasons)))
+        if query.start is not None:
+            filters.append(('timestamp', '>=', query.start))
+        if query.end is not None:
+            filters.append(('timestamp', '<=', query.end))
+
+        table = pq.read_table(
+            source,
+            columns=COLUMNS,
+            filters=filters or None
+        )
+        df = table.to_pandas()
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    @staticmethod
+    def read_store(
+        store: HistoryStore,
+        query: Optional[HistoryQuery] = None
+    ) -> pd.DataFrame:
+        """Выборка из колоночного хранилища.
+
+        Города выбираются по индексу смещений, диапазон дат — бинарным
+        поиском внутри отсортированного среза города.
+
+        Args:
+            store: Открытое хранилище
+            query: Параметры выборки
+
+        Returns:
+            pd.DataFrame: Отфильтрованные данные
+        """
+        query = query or HistoryQuery()
+        cities = store.cities if query.cities is None else query.cities
+        parts = []
+        for city in cities:
+            if city not in store:
+                continue
+            rows = store.city_slice(city)
+            timestamps = store.timestamps[rows]
+            lo, hi = 0, len(timestamps)
+            if query.start is not None:
+                lo = np.searchsorted(timestamps, query.start.value, 'left')
+            if query.end is not None:
+                hi = np.searchsorted(timestamps, query.end.value, 'right')
+            frame = store.city_frame(city).iloc[lo:hi]
+            if query.seasons is not None:
+                frame = frame[frame['season'].isin(query.seasons)]
+            parts.append(frame)
+
+        if not parts:
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    @staticmethod
+    def read(source, query: Optional[HistoryQuery] = None) -> pd.DataFrame:
+        """Чтение данных с выбором способа по типу источника.
+
+        Файлы .parquet и каталоги читаются как наборы Parquet,
+        остальные источники — как CSV.
+        """
+        if isinstance(source, HistoryStore):
+            df = QueryService.read_store(source, query)
+        elif str(source).endswith('.parquet') or (
+            isinstance(source, (str, Path)) and Path(source).is_dir()
+        ):
+            df = QueryService.read_parquet(source, query)
+        else:
+            df = QueryService.read_csv(source, query)
+        logger.info(f"Загружено строк по запросу: {len(df)}")
+        return df
@@ -0,0 +1,338 @@
+"""Предварительно агрегированные данные по месяцам и годам.
+
+Для каждого города хранятся аддитивные агрегаты (количество, сумма,
+сумма квадратов, минимум, максимум, число аномалий), поэтому новые
+данные добавляются без пересчета всей истории, а среднее и стандартное
+отклонение выводятся из агрегатов при чтении.
+
+Агрегаты сохраняются на диск рядом с колоночным хранилищем набора
+данных и при следующих запусках загружаются, а не строятся заново.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import ANOMALY_THRESHOLD, ROLLING_WINDOW, ROLLUP_MAX_POINTS
+from src.services.analysis_service import AnalysisService, TemperatureAnalysis
+from src.services.cache_service import atomic_directory
+from src.services.storage_service import HistoryStore
+from src.core.logger import logger
+
+LEVELS = ('daily', 'monthly', 'yearly')
+LEVEL_KEYS = {
+    'monthly': ['city', 'year', 'month'],
+    'yearly': ['city', 'year']
+}
+# Способ объединения каждого агрегата при слиянии
+MERGE_AGG = {
+    'count': 'sum',
+    'sum': 'sum',
+    'sum_sq': 'sum',
+    'min': 'min',
+    'max': 'max',
+    'anomaly_count': 'sum'
+}
+# Приблизительная длительность периода уровня в днях
+LEVEL_DAYS = {'daily': 1, 'monthly': 30.44, 'yearly': 365.25}
+# Частота периода уровня для округления дат
+LEVEL_PERIODS = {'monthly': 'M', 'yearly': 'Y'}
+
+ROLLUP_DIR_NAME = "rollups"
+META_FILE = "meta.json"
+
+
+@dataclass
+class TemperatureRollups:
+    """Агрегаты температур по месяцам и годам для всех городов."""
+    monthly: pd.DataFrame
+    yearly: pd.DataFrame
+
+    def frame(self, level: str, city: Optional[str] = None) -> pd.DataFrame:
+        """Агрегаты уровня с производными статистиками.
+
+        Args:
+            level: Уровень агрегации ('monthly' или 'yearly')
+            city: Название города. Если None, возвращаются все города
+
+        Returns:
+            pd.DataFrame: Агрегаты с колонками timestamp, mean, std, min,
+                max, count, anomaly_count
+        """
+        data = getattr(self, level).reset_index()
+        if city is not None:
+            data = data[data['city'] == city]
+
+        count = data['count']
+        mean = data['sum'] / count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = (data['sum_sq'] - data['sum'] * mean) / (count - 1)
+        month = data['month'] if 'month' in data else 1
+
+        return data.assign(
+            timestamp=pd.to_datetime(
+                pd.DataFrame({'year': data['year'], 'month': month, 'day': 1})
+            ),
+            mean=mean,
+            std=np.sqrt(var.clip(lower=0))
+        ).drop(columns=['sum', 'sum_sq']).reset_index(drop=True)
+
+
+class RollupService:
+    """Сервис построения и обновления агрегатов температур."""
+
+    @staticmethod
+    def _aggregate_monthly(df: pd.DataFrame) -> pd.DataFrame:
+        """Агрегация дневных данных по (город, год, месяц)."""
+        temperature = df['temperature']
+        anomalies = (
+            df['is_anomaly'].astype(int)
+            if 'is_anomaly' in df else pd.Series(0, index=df.index)
+        )
+        daily = pd.DataFrame({
+            'city': df['city'].astype(str),
+            'year': df['timestamp'].dt.year,
+            'month': df['timestamp'].dt.month,
+            'count': 1,
+            'sum': temperature,
+            'sum_sq': temperature ** 2,
+            'min': temperature,
+            'max': temperature,
+            'anomaly_count': anomalies
+        })
+        return daily.groupby(LEVEL_KEYS['monthly']).agg(MERGE_AGG)
+
+    @staticmethod
+    def _monthly_to_yearly(monthly: pd.DataFrame) -> pd.DataFrame:
+        """Объединение месячных агрегатов в годовые."""
+        return monthly.groupby(level=LEVEL_KEYS['yearly']).agg(MERGE_AGG)
+
+    @staticmethod
+    def build(df: pd.DataFrame) -> TemperatureRollups:
+        """Построение агрегатов по дневным данным.
+
+        Args:
+            df: DataFrame с колонками city, timestamp, temperature
+                и, при наличии, is_anomaly
+
+        Returns:
+            TemperatureRollups: Месячные и годовые агрегаты
+        """
+        monthly = RollupService._aggregate_monthly(df)
+        yearly = RollupService._monthly_to_yearly(monthly)
+        logger.info(
+            f"Построены агрегаты: {len(monthly)} месячных, "
+            f"{len(yearly)} годовых"
+        )
+        return TemperatureRollups(monthly=monthly, yearly=yearly)
+
+    @staticmethod
+    def build_from_analyses(
+        analyses: Dict[str, TemperatureAnalysis]
+    ) -> TemperatureRollups:
+        """Построение агрегатов по результатам анализа городов."""
+        return RollupService.build(
+            pd.concat([analysis.data for analysis in analyses.values()])
+        )
+
+    @staticmethod
+    def _merge(base: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        """Слияние агрегатов delta с base без перегруппировки base.
+
+        Строки base, ключей которых нет в delta, не пересчитываются;
+        для общих ключей агрегаты объединяются поэлементно, новые
+        ключи добавляются.
+        """
+        common = delta.index.intersection(base.index)
+        result = base.copy()
+        if len(common):
+            old, new = base.loc[common], delta.loc[common]
+            combined = {}
+            for column, how in MERGE_AGG.items():
+                if how == 'sum':
+                    combined[column] = old[column] + new[column]
+                elif how == 'min':
+                    combined[column] = np.minimum(old[column], new[column])
+                else:
+                    combined[column] = np.maximum(old[column], new[column])
+            result.loc[common] = pd.DataFrame(combined, index=common)
+
+        added = delta[~delta.index.isin(base.index)]
+        if len(added):
+            result = pd.concat([result, added]).sort_index()
+        return result
+
+    @staticmethod
+    def update(
+        rollups: TemperatureRollups,
+        df: pd.DataFrame
+    ) -> TemperatureRollups:
+        """Добавление новых дневных данных к существующим агрегатам.
+
+        Агрегируются только новые строки; изменяются лишь месяцы и годы,
+        в которые они попали. Так как агрегаты аддитивны, годовые
+        обновляются по агрегатам новых строк, без пересчета месяцев.
+
+        Args:
+            rollups: Существующие агрегаты
+            df: Новые дневные данные
+
+        Returns:
+            TemperatureRollups: Обновленные агрегаты
+        """
+        delta = RollupService._aggregate_monthly(df)
+        return TemperatureRollups(
+            monthly=RollupService._merge(rollups.monthly, delta),
+            yearly=RollupService._merge(
+                rollups.yearly, RollupService._monthly_to_yearly(delta)
+            )
+        )
+
+    @staticmethod
+    def save(
+        rollups: TemperatureRollups,
+        directory: Path,
+        meta: Optional[dict] = None
+    ) -> None:
+        """Сохранение агрегатов на диск с атомарной заменой каталога.
+
+        Args:
+            rollups: Агрегаты
+            directory: Каталог агрегатов
+            meta: Параметры, с которыми построены агрегаты
+        """
+        with atomic_directory(directory) as tmp:
+            for level in LEVEL_KEYS:
+                data = getattr(rollups, level).reset_index()
+                np.savez(
+                    tmp / f"{level}.npz",
+                    **{
+                        column: data[column].to_numpy(
+                            dtype=str if column == 'city' else None
+                        )
+                        for column in data.columns
+                    }
+                )
+            with open(tmp / META_FILE, 'w', encoding='utf-8') as f:
+                json.dump(meta or {}, f, ensure_ascii=False)
+        logger.info(f"Агрегаты сохранены в {directory}")
+
+    @staticmethod
+    def load(
+        directory: Path
+    ) -> Tuple[Optional[TemperatureRollups], dict]:
+        """Загрузка агрегатов с диска.
+
+        Returns:
+            Tuple: Агрегаты (или None, если их нет) и параметры построения
+        """
+        meta_path = directory / META_FILE
+        if not meta_path.exists():
+            return None, {}
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+
+        levels = {}
+        for level, keys in LEVEL_KEYS.items():
+            with np.load(directory / f"{level}.npz") as columns:
+                data = pd.DataFrame({name: columns[name] for name in columns})
+            levels[level] = data.set_index(keys)
+        return TemperatureRollups(**levels), meta
+
+    @staticmethod
+    async def load_or_build(
+        store: HistoryStore,
+        analyses: Optional[Dict[str, TemperatureAnalysis]] = None
+    ) -> TemperatureRollups:
+        """Загрузка агрегатов набора данных или их построение.
+
+        Агрегаты хранятся в подкаталоге хранилища, поэтому привязаны
+        к его отпечатку. Число аномалий зависит от параметров анализа,
+        которые проверяются по метаданным.
+
+        Args:
+            store: Открытое хранилище набора данных
+            analyses: Готовые результаты анализа всех городов, если есть
+
+        Returns:
+            TemperatureRollups: Месячные и годовые агрегаты
+        """
+        directory = store.directory / ROLLUP_DIR_NAME
+        meta = {
+            'fingerprint': store.fingerprint,
+            'window': ROLLING_WINDOW,
+            'threshold': ANOMALY_THRESHOLD
+        }
+        rollups, saved_meta = RollupService.load(directory)
+        if rollups is not None and saved_meta == meta:
+            logger.info(f"Агрегаты загружены из {directory}")
+            return rollups
+
+        if analyses is None:
+            analyses = await AnalysisService.analyze_all_cities_from_store(
+                store
+            )
+        rollups = RollupService.build_from_analyses(analyses)
+        RollupService.save(rollups, directory, meta)
+        return rollups
+
+    @staticmethod
+    def choose_level(
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        max_points: int = ROLLUP_MAX_POINTS
+    ) -> str:
+        """Самый детальный уровень, укладывающийся в max_points точек.
+
+        Args:
+            start: Начало периода
+            end: Конец периода
+            max_points: Максимальное число точек на город
+
+        Returns:
+            str: 'daily', 'monthly' или 'yearly'
+        """
+        days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+        for level in LEVELS:
+            if days / LEVEL_DAYS[level] <= max_points:
+                return level
+        return LEVELS[-1]
+
+    @staticmethod
+    def resolve(
+        rollups: TemperatureRollups,
+        daily: pd.DataFrame,
+        city: str,
+        max_points: int = ROLLUP_MAX_POINTS
+    ) -> Tuple[str, pd.DataFrame]:
+        """Выбор уровня детализации для периода данных города.
+
+        Args:
+            rollups: Агрегаты
+            daily: Дневные данные города
+            city: Название города
+            max_points: Максимальное число точек
+
+        Returns:
+            Tuple[str, pd.DataFrame]: Уровень и данные этого уровня
+                за период daily. Для дневного уровня возвращаются исходные данные с
+                колонкой mean, равной температуре.
+        """
+        if daily.empty:
+            return 'daily', daily.assign(mean=daily['temperature'])
+        first, last = daily['timestamp'].min(), daily['timestamp'].max()
+        level = RollupService.choose_level(first, last, max_points)
+        if level == 'daily':
+            return level, daily.assign(mean=daily['temperature'])
+
+        # Агрегаты датируются началом периода, поэтому начало диапазона
+        # округляется вниз до начала месяца или года
+        data = rollups.frame(level, city)
+        first = first.to_period(LEVEL_PERIODS[level]).start_time
+        return level, data[
+            (data['timestamp'] >= first) & (data['timestamp'] <= last)
+        ].reset_index(drop=True)
@@ -0,0 +1,215 @@
+"""Колоночное хранилище исторических данных на диске.
+
+История хранится отсортированной по (город, дата) в виде отдельных
+.npy-колонок, которые открываются через memory-map. Индекс смещений
+город → (начало, конец) позволяет получить данные одного города срезом
+без просмотра всего набора и без копирования. Несколько процессов,
+открывших одно хранилище, разделяют одни и те же страницы памяти.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import STORE_DIR
+from src.services.cache_service import (
+    atomic_directory,
+    dataset_fingerprint,
+    load_or_build
+)
+from src.core.logger import logger
+
+TIMESTAMP_FILE = "timestamp.npy"
+TEMPERATURE_FILE = "temperature.npy"
+SEASON_FILE = "season.npy"
+META_FILE = "meta.json"
+
+
+class HistoryStore:
+    """Открытое колоночное хранилище исторических данных."""
+
+    def __init__(
+        self,
+        directory: Path,
+        offsets: Dict[str, Tuple[int, int]],
+        seasons: List[str],
+        timestamps: np.ndarray,
+        temperatures: np.ndarray,
+        season_codes: np.ndarray,
+        fingerprint: str = ""
+    ):
+        self.directory = directory
+        self.offsets = offsets
+        self.seasons = seasons
+        self.timestamps = timestamps
+        self.temperatures = temperatures
+        self.season_codes = season_codes
+        self.fingerprint = fingerprint
+
+    @property
+    def cities(self) -> List[str]:
+        """Список городов в порядке хранения."""
+        return list(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.temperatures)
+
+    def __contains__(self, city: str) -> bool:
+        return city in self.offsets
+
+    def city_slice(self, city: str) -> slice:
+        """Диапазон строк города в колонках хранилища."""
+        if city not in self.offsets:
+            raise KeyError(f"Город {city} отсутствует в хранилище")
+        start, end = self.offsets[city]
+        return slice(start, end)
+
+    def _frame(self, rows: slice, city_codes, cities) -> pd.DataFrame:
+        """Сборка DataFrame из срезов колонок без копирования данных."""
+        return pd.DataFrame(
+            {
+                'city': pd.Categorical.from_codes(city_codes, cities),
+                'timestamp': self.timestamps[rows].view('datetime64[ns]'),
+                'temperature': self.temperatures[rows],
+                'season': pd.Categorical.from_codes(
+                    self.season_codes[rows], self.seasons
+                )
+            },
+            copy=False
+        )
+
+    def city_frame(self, city: str) -> pd.DataFrame:
+        """Данные одного города.
+
+        Args:
+            city: Название города
+
+        Returns:
+            pd.DataFrame: Данные города, отсортированные по дате
+        """
+        rows = self.city_slice(city)
+        city_codes = np.zeros(rows.stop - rows.start, dtype=np.int8)
+        return self._frame(rows, city_codes, [city])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Полный набор данных в виде DataFrame."""
+        lengths = [end - start for start, end in self.offsets.values()]
+        city_codes = np.repeat(
+            np.arange(len(lengths), dtype=np.int32), lengths
+        )
+        return self._frame(slice(0, len(self)), city_codes, self.cities)
+
+
+class HistoryStoreService:
+    """Сервис построения и открытия колоночного хранилища."""
+
+    @staticmethod
+    def build(
+        df: pd.DataFrame,
+        directory: Path,
+        fingerprint: Optional[str] = None
+    ) -> None:
+        """Запись набора данных в колоночное хранилище.
+
+        Колонки записываются во временный каталог, который затем
+        атомарно подменяет directory.
+
+        Args:
+            df: Подготовленный DataFrame (city, timestamp, temperature, season)
+            directory: Каталог хранилища
+            fingerprint: Отпечаток df, если он уже вычислен
+        """
+        codes, cities = pd.factorize(df['city'], sort=True)
+        season_codes, seasons = pd.factorize(df['season'], sort=True)
+        timestamps = (
+            pd.to_datetime(df['timestamp'])
+            .to_numpy(dtype='datetime64[ns]')
+            .view(np.int64)
+        )
+        order = np.lexsort((timestamps, codes))
+
+        counts = np.bincount(codes, minlength=len(cities))
+        ends = np.cumsum(counts)
+        offsets = {
+            str(city): [int(end - count), int(end)]
+            for city, count, end in zip(cities, counts, ends)
+        }
+
+        with atomic_directory(directory) as tmp:
+            np.save(tmp / TIMESTAMP_FILE, timestamps[order])
+            np.save(
+                tmp / TEMPERATURE_FILE,
+                df['temperature'].to_numpy(dtype=np.float64)[order]
+            )
+            np.save(tmp / SEASON_FILE, season_codes.astype(np.int8)[order])
+            with open(tmp / META_FILE, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {
+                        'offsets': offsets,
+                        'seasons': list(map(str, seasons)),
+                        'fingerprint': fingerprint or dataset_fingerprint(df)
+                    },
+                    f,
+                    ensure_ascii=False
+                )
+        logger.info(
+            f"Построено хранилище: {len(df)} строк, {len(cities)} городов "
+            f"в {directory}"
+        )
+
+    @staticmethod
+    def open(directory: Path) -> Optional[HistoryStore]:
+        """Открытие хранилища в режиме memory-map.
+
+        Returns:
+            Optional[HistoryStore]: Хранилище или None, если его нет
+        """
+        meta_path = directory / META_FILE
+        if not meta_path.exists():
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        return HistoryStore(
+            directory=directory,
+            offsets={
+                city: (start, end)
+                for city, (start, end) in meta['offsets'].items()
+            },
+            seasons=meta['seasons'],
+            timestamps=np.load(directory / TIMESTAMP_FILE, mmap_mode='r'),
+            temperatures=np.load(directory / TEMPERATURE_FILE, mmap_mode='r'),
+            season_codes=np.load(directory / SEASON_FILE, mmap_mode='r'),
+            fingerprint=meta['fingerprint']
+        )
+
+    @staticmethod
+    def load_or_build(
+        df: pd.DataFrame,
+        directory: Path = STORE_DIR,
+        fingerprint: Optional[str] = None
+    ) -> HistoryStore:
+        """Открытие хранилища для набора данных или его построение.
+
+        Каждый набор данных хранится в отдельном подкаталоге, имя которого
+        определяется отпечатком содержимого данных.
+
+        Args:
+            df: DataFrame с историческими данными
+            directory: Корневой каталог хранилищ
+            fingerprint: Отпечаток df, если он уже вычислен
+
+        Returns:
+            HistoryStore: Открытое хранилище
+        """
+        return load_or_build(
+            directory,
+            df,
+            HistoryStoreService.open,
+            lambda target, fingerprint: HistoryStoreService.build(
+                df, target, fingerprint
+            ),
+            fingerprint
+        )
@@ -0,0 +1,280 @@
+"""Анализ чувствительности к параметрам поиска аномалий.
+
+Количество аномалий по городам рассчитывается сразу для множества
+значений окна скользящего среднего и порога в стандартных отклонениях.
+Групповые суммы по (город, сезон) и упорядоченные внутри групп значения
+вычисляются один раз, после чего пороги для всех групп проверяются
+векторным бинарным поиском по уже отсортированным массивам.
+
+Поддерживаются два правила:
+- сезонное (как в AnalysisService): температура выходит за пределы
+  среднее сезона ± порог · σ сезона, окно на результат не влияет;
+- скользящее: отклонение температуры от центрированного скользящего
+  среднего по модулю больше порог · σ сезона.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config import SWEEP_THRESHOLDS, SWEEP_WINDOWS
+from src.core.logger import logger
+
+
+def _sorted_searchsorted(
+    values: np.ndarray,
+    queries: np.ndarray,
+    side: str
+) -> np.ndarray:
+    """np.searchsorted с предварительной сортировкой запросов.
+
+    Для упорядоченных запросов бинарный поиск продолжается с позиции
+    предыдущего, что на больших массивах заметно быстрее.
+    """
+    flat = queries.ravel()
+    order = np.argsort(flat, kind='stable')
+    result = np.empty(len(flat), dtype=np.int64)
+    result[order] = np.searchsorted(values, flat[order], side)
+    return result.reshape(queries.shape)
+
+
+@dataclass
+class GroupedSorted:
+    """Значения, упорядоченные внутри групп, для поиска без циклов.
+
+    Значения сортируются один раз глобально; позиция значения в этом
+    порядке объединяется с номером группы в ключ
+    group * (n + 1) + position. Ключи всех групп образуют один
+    отсортированный массив, поэтому границы для всех групп и порогов
+    находятся двумя вызовами np.searchsorted.
+    """
+    values: np.ndarray
+    keys: np.ndarray
+    group_starts: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        values: np.ndarray,
+        groups: np.ndarray,
+        n_groups: int
+    ) -> 'GroupedSorted':
+        """Глобальная сортировка значений и построение ключей групп."""
+        order = np.argsort(values, kind='stable')
+        position = np.empty(len(values), dtype=np.int64)
+        position[order] = np.arange(len(values))
+        counts = np.bincount(groups, minlength=n_groups)
+        keys = groups.astype(np.int64) * (len(values) + 1) + position
+        return cls(
+            values=values[order],
+            keys=np.sort(keys),
+            group_starts=np.concatenate(([0], np.cumsum(counts)[:-1]))
+        )
+
+    def count_below(self, limits: np.ndarray, side: str) -> np.ndarray:
+        """Количество значений группы левее границы.
+
+        Args:
+            limits: Границы для каждой группы (G × T)
+            side: 'left' — значения < границы, 'right' — значения <= границы
+
+        Returns:
+            np.ndarray: Количества (G × T)
+        """
+        # Позиция границы в глобальном порядке: значения группы левее
+        # границы — ровно те, чья позиция меньше
+        rank = _sorted_searchsorted(self.values, limits, side)
+        groups = np.arange(limits.shape[0], dtype=np.int64)[:, None]
+        query = groups * (len(self.values) + 1) + rank
+        return (
+            _sorted_searchsorted(self.keys, query, 'left') -
+            self.group_starts[:, None]
+        )
+
+
+@dataclass
+class ParameterSweep:
+    """Общие промежуточные результаты для перебора параметров.
+
+    Строки упорядочены по (город, дата). Группа — пара (город, сезон)
+    с номером city_code * len(seasons) + season_code.
+    """
+    cities: List[str]
+    seasons: List[str]
+    temperature: np.ndarray
+    city_bounds: np.ndarray
+    groups: np.ndarray
+    group_mean: np.ndarray
+    group_std: np.ndarray
+    group_sizes: np.ndarray
+    sorted_temperature: GroupedSorted
+
+    def _city_table(self, counts: np.ndarray, columns: pd.Index) -> pd.DataFrame:
+        """Сумма количеств групп (G × T) по сезонам в таблицу город × T."""
+        by_city = counts.reshape(len(self.cities), len(self.seasons), -1)
+        return pd.DataFrame(
+            by_city.sum(axis=1),
+            index=pd.Index(self.cities, name='city'),
+            columns=columns
+        )
+
+    def seasonal(
+        self,
+        thresholds: Sequence[float] = SWEEP_THRESHOLDS
+    ) -> pd.DataFrame:
+        """Количество аномалий по сезонному правилу.
+
+        Args:
+            thresholds: Пороги в стандартных отклонениях
+
+        Returns:
+            pd.DataFrame: Таблица город × порог
+        """
+        k = np.asarray(thresholds, dtype=float)
+        mean = self.group_mean[:, None]
+        std = self.group_std[:, None]
+        upper = mean + k * std
+        lower = mean - k * std
+
+        below = self.sorted_temperature.count_below(lower, 'left')
+        above = (
+            self.group_sizes[:, None] -
+            self.sorted_temperature.count_below(upper, 'right')
+        )
+        # При неопределенном σ (одно наблюдение) аномалий нет
+        counts = np.where(np.isnan(std), 0, below + above)
+        return self._city_table(
+            counts, pd.Index(thresholds, name='threshold')
+        )
+
+    def rolling_mean(self, window: int) -> np.ndarray:
+        """Центрированное скользящее среднее по кумулятивным суммам.
+
+        Совпадает с rolling(window, center=True).mean() внутри каждого
+        города: окно не пересекает границы городов, у краев — NaN.
+        """
+        cumsum = np.concatenate(([0.0], np.cumsum(self.temperature)))
+        rows = np.arange(len(self.temperature))
+        lo = rows - window // 2
+        hi = lo + window
+
+        city = np.repeat(
+            np.arange(len(self.cities)), np.diff(self.city_bounds)
+        )
+        valid = (
+            (lo >= self.city_bounds[city]) &
+            (hi <= self.city_bounds[city + 1])
+        )
+        result = np.full(len(rows), np.nan)
+        result[valid] = (cumsum[hi[valid]] - cumsum[lo[valid]]) / window
+        return result
+
+    def rolling(
+        self,
+        windows: Sequence[int] = SWEEP_WINDOWS,
+        thresholds: Sequence[float] = SWEEP_THRESHOLDS
+    ) -> pd.DataFrame:
+        """Количество аномалий по правилу скользящего среднего.
+
+        Для каждого окна отклонения сортируются один раз, все пороги
+        для этого окна проверяются бинарным поиском.
+
+        Args:
+            windows: Окна скользящего среднего (дней)
+            thresholds: Пороги в стандартных отклонениях
+
+        Returns:
+            pd.DataFrame: Таблица город × (окно, порог)
+        """
+        k = np.asarray(thresholds, dtype=float)
+        limits = k * self.group_std[:, None]
+        tables = {}
+        for window in windows:
+            deviation = np.abs(self.temperature - self.rolling_mean(window))
+            # Строки без скользящего среднего не считаются аномалиями
+            deviation = np.nan_to_num(deviation, nan=-1.0)
+            sorted_deviation = GroupedSorted.build(
+                deviation, self.groups, len(self.group_sizes)
+            )
+            counts = (
+                self.group_sizes[:, None] -
+                sorted_deviation.count_below(limits, 'right')
+            )
+            counts = np.where(np.isnan(limits), 0, counts)
+            tables[window] = self._city_table(
+                counts, pd.Index(thresholds, name='threshold')
+            )
+        return pd.concat(tables, axis=1, names=['window'])
+
+
+class SweepService:
+    """Сервис перебора параметров поиска аномалий."""
+
+    @staticmethod
+    def prepare(df: pd.DataFrame) -> ParameterSweep:
+        """Расчет общих промежуточных результатов за один проход.
+
+        Args:
+            df: DataFrame с колонками city, timestamp, temperature, season
+
+        Returns:
+            ParameterSweep: Групповые статистики и отсортированные массивы
+        """
+        city_codes, cities = pd.factorize(df['city'], sort=True)
+        season_codes, seasons = pd.factorize(df['season'], sort=True)
+        order = np.lexsort((df['timestamp'].to_numpy(), city_codes))
+        city_codes = city_codes[order]
+        temperature = df['temperature'].to_numpy(dtype=float)[order]
+        groups = city_codes * len(seasons) + season_codes[order]
+        n_groups = len(cities) * len(seasons)
+
+        # Групповые суммы: среднее и σ (ddof=1) по (город, сезон)
+        count = np.bincount(groups, minlength=n_groups)
+        total = np.bincount(groups, temperature, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            squares = np.bincount(
+                groups, (temperature - mean[groups]) ** 2, minlength=n_groups
+            )
+            std = np.sqrt(squares / (count - 1))
+        std[count < 2] = np.nan
+
+        logger.info(
+            f"Подготовлен перебор параметров: {len(cities)} городов, "
+            f"{len(temperature)} строк"
+        )
+        return ParameterSweep(
+            cities=list(map(str, cities)),
+            seasons=list(map(str, seasons)),
+            temperature=temperature,
+            city_bounds=np.concatenate(
+                ([0], np.cumsum(np.bincount(city_codes, minlength=len(cities))))
+            ),
+            groups=groups,
+            # Округление как в сезонной статистике AnalysisService
+            group_mean=mean.round(2),
+            group_std=std.round(2),
+            group_sizes=count,
+            sorted_temperature=GroupedSorted.build(
+                temperature, groups, n_groups
+            )
+        )
+
+    @staticmethod
+    def sensitivity(
+        sweep: ParameterSweep,
+        windows: Sequence[int] = SWEEP_WINDOWS,
+        thresholds: Sequence[float] = SWEEP_THRESHOLDS
+    ) -> Dict[str, pd.DataFrame]:
+        """Таблицы чувствительности для обоих правил.
+
+        Returns:
+            Dict: 'seasonal' — город × порог,
+                'rolling' — город × (окно, порог)
+        """
+        return {
+            'seasonal': sweep.seasonal(thresholds),
+            'rolling': sweep.rolling(windows, thresholds)
+        }
@@ -147,7 +147,8 @@ class VisualizationService:
         """Создание тепловой карты аномалий по месяцам и годам.
 
         Args:
-            data: DataFrame с температурными данными
+            data: DataFrame с дневными данными или месячными агрегатами
+                RollupService
             city: Название города
             ax: Объект осей для отрисовки. Если None, создается новая фигура
 
@@ -159,17 +160,26 @@ class VisualizationService:
         else:
             fig = ax.figure
 
-        # Подготовка данных для тепловой карты
-        data = data.copy()
-        data['year'] = data['timestamp'].dt.year
-        data['month'] = data['timestamp'].dt.month
-
-        anomalies_pivot = data.pivot_table(
-            values='is_anomaly',
-            index='year',
-            columns='month',
-            aggfunc='sum'
-        ).astype(int)
+        if 'anomaly_count' in data.columns:
+            # Месячные агрегаты уже содержат число аномалий
+            anomalies_pivot = data.pivot_table(
+                values='anomaly_count',
+                index='year',
+                columns='month',
+                aggfunc='sum'
+            ).fillna(0).astype(int)
+        else:
+            # Подготовка данных для тепловой карты
+            data = data.copy()
+            data['year'] = data['timestamp'].dt.year
+            data['month'] = data['timestamp'].dt.month
+
+            anomalies_pivot = data.pivot_table(
+                values='is_anomaly',
+                index='year',
+                columns='month',
+                aggfunc='sum'
+            ).astype(int)
 
         sns.heatmap(
             anomalies_pivot,
@@ -182,3 +192,86 @@ class VisualizationService:
         ax.set_ylabel('Год')
 
         return fig
+
+    @staticmethod
+    def plot_long_term_trend(
+        data: pd.DataFrame,
+        city: str,
+        level: str,
+        ax: plt.Axes = None
+    ) -> plt.Figure:
+        """Создание графика долгосрочного тренда по агрегированным данным.
+
+        Args:
+            data: DataFrame уровня агрегации из RollupService.resolve
+            city: Название города
+            level: Уровень агрегации ('daily', 'monthly' или 'yearly')
+            ax: Объект осей для отрисовки. Если None, создается новая фигура
+
+        Returns:
+            plt.Figure: Объект с построенным графиком
+        """
+        if ax is None:
+            fig, ax = plt.subplots(figsize=PLOT_FIGSIZE, dpi=PLOT_DPI)
+        else:
+            fig = ax.figure
+
+        if {'min', 'max'}.issubset(data.columns):
+            ax.fill_between(
+                data['timestamp'],
+                data['min'],
+                data['max'],
+                color=TEMPERATURE_COLORS['normal'],
+                alpha=0.2,
+                label='Минимум / максимум'
+            )
+
+        ax.plot(
+            data['timestamp'],
+            data['mean'],
+            color=TEMPERATURE_COLORS['rolling'],
+            marker='o' if level == 'yearly' else None,
+            label='Средняя температура'
+        )
+
+        ax.set_title(f'Долгосрочный тренд температур для города {city}')
+        ax.set_xlabel('Дата')
+        ax.set_ylabel('Температура (°C)')
+        ax.legend()
+
+        return fig
+
+    @staticmethod
+    def plot_correlation_heatmap(
+        correlation: pd.DataFrame,
+        ax: plt.Axes = None
+    ) -> plt.Figure:
+        """Создание тепловой карты корреляций температур между городами.
+
+        Args:
+            correlation: Матрица корреляций город × город
+            ax: Объект осей для отрисовки. Если None, создается новая фигура
+
+        Returns:
+            plt.Figure: Объект с построенным графиком
+        """
+        if ax is None:
+            fig, ax = plt.subplots(figsize=PLOT_FIGSIZE, dpi=PLOT_DPI)
+        else:
+            fig = ax.figure
+
+        sns.heatmap(
+            correlation,
+            ax=ax,
+            cmap='coolwarm',
+            vmin=-1,
+            vmax=1,
+            annot=len(correlation) <= 20,
+            fmt='.2f'
+        )
+
+        ax.set_title('Корреляция температурных отклонений между городами')
+        ax.set_xlabel('')
+        ax.set_ylabel('')
+
+        return fig
@@ -1,11 +1,11 @@
 import aiohttp
 import time
-import pandas as pd
 from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 import streamlit as st
 from src.config import OPENWEATHER_API_BASE_URL, CACHE_TTL_SECONDS
-from src.services.analysis_service import TemperatureAnalysis
+from src.services.climatology_service import ClimatologyIndex
 from src.core.logger import logger
 
 
@@ -14,6 +14,7 @@ class WeatherInfo:
     temperature: float
     is_anomaly: bool
     error: Optional[str] = None
+    measured_on: Optional[date] = None
 
 
 class WeatherService:
@@ -27,7 +28,7 @@ class WeatherService:
     async def get_current_temperature(
         self,
         city: str,
-        city_analysis: TemperatureAnalysis,
+        climatology: ClimatologyIndex,
         api_key: str
     ) -> WeatherInfo:
         """Асинхронное получение текущей температуры с кэшированием."""
@@ -48,7 +49,7 @@ class WeatherService:
         else:
             logger.info(f"Cache miss для {city}")
 
-        result = await self._fetch_temperature(city, city_analysis, api_key)
+        result = await self._fetch_temperature(city, climatology, api_key)
 
         st.session_state.weather_cache[cache_key] = result
         st.session_state.weather_cache_time[cache_key] = current_time
@@ -59,18 +60,25 @@ class WeatherService:
     @staticmethod
     def is_temperature_anomaly(
         temperature: float,
-        seasonal_stats: pd.DataFrame,
-        current_season: str
+        climatology: ClimatologyIndex,
+        city: str,
+        current_date: date
     ) -> bool:
-        """Проверка на аномалию температуры."""
-        mean = seasonal_stats.loc[current_season, ('temperature', 'mean')]
-        std = seasonal_stats.loc[current_season, ('temperature', 'std')]
-        return (temperature > mean + 2 * std) or (temperature < mean - 2 * std)
+        """Проверка на аномалию температуры относительно нормы дня года."""
+        return climatology.is_anomaly(city, current_date, temperature)
+
+    @staticmethod
+    def _local_date(data: dict) -> date:
+        """Локальная дата измерения по ответу OpenWeatherMap."""
+        if 'dt' not in data:
+            return date.today()
+        offset = timedelta(seconds=data.get('timezone', 0))
+        return datetime.fromtimestamp(data['dt'], tz=timezone(offset)).date()
 
     @staticmethod
     async def _fetch_temperature(
         city: str,
-        city_analysis: TemperatureAnalysis,
+        climatology: ClimatologyIndex,
         api_key: str
     ) -> WeatherInfo:
         """Асинхронное получение текущей температуры."""
@@ -94,14 +102,17 @@ class WeatherService:
 
                     if response.status == 200:
                         logger.success(f"200: получены данные для {city}")
+                        measured_on = WeatherService._local_date(data)
                         is_anomaly = WeatherService.is_temperature_anomaly(
                             data['main']['temp'],
-                            city_analysis.seasonal_stats,
-                            city_analysis.data['season'].iloc[-1]
+                            climatology,
+                            city,
+                            measured_on
                         )
                         return WeatherInfo(
                             temperature=data['main']['temp'],
-                            is_anomaly=is_anomaly
+                            is_anomaly=is_anomaly,
+                            measured_on=measured_on
                         )
 
                     error_message = data.get('message', 'Неизвестная ошибка')
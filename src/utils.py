@@ -7,6 +7,11 @@ import time
 import pandas as pd
 import aiofiles
 
+from src.services.query_service import HistoryQuery, QueryService
+from src.services.storage_service import HistoryStore, HistoryStoreService
+
+REQUIRED_COLUMNS = {'city', 'timestamp', 'temperature', 'season'}
+
 
 def validate_and_prepare_dataframe(
     df: pd.DataFrame
@@ -22,10 +27,8 @@ def validate_and_prepare_dataframe(
             - str: сообщение об ошибке или успехе
             - Optional[pd.DataFrame]: подготовленный DataFrame или None
     """
-    required_columns = {'city', 'timestamp', 'temperature', 'season'}
-
-    if not required_columns.issubset(df.columns):
-        missing = required_columns - set(df.columns)
+    if not REQUIRED_COLUMNS.issubset(df.columns):
+        missing = REQUIRED_COLUMNS - set(df.columns)
         return False, f"Отсутствуют обязательные колонки: {missing}", None
 
     try:
@@ -54,11 +57,44 @@ def validate_and_prepare_dataframe(
         return False, f"Ошибка при подготовке данных: {str(e)}", None
 
 
-async def load_csv_async(file) -> Tuple[bool, str, Optional[pd.DataFrame]]:
+def parse_csv(
+    content: str,
+    query: Optional[HistoryQuery] = None
+) -> Tuple[bool, str, Optional[pd.DataFrame]]:
+    """Разбор и проверка содержимого CSV файла.
+
+    Args:
+        content: Текст CSV
+        query: Параметры выборки; фильтры применяются при чтении по частям
+
+    Returns:
+        Tuple[bool, str, Optional[pd.DataFrame]]:
+            - bool: успешна ли загрузка
+            - str: сообщение об ошибке или успехе
+            - Optional[pd.DataFrame]: загруженный DataFrame или None
+    """
+    try:
+        # Колонки проверяются по заголовку до фильтрации по частям
+        header = pd.read_csv(StringIO(content), nrows=0)
+        if not REQUIRED_COLUMNS.issubset(header.columns):
+            return validate_and_prepare_dataframe(header)
+
+        df = QueryService.read_csv(StringIO(content), query)
+        return validate_and_prepare_dataframe(df)
+
+    except Exception as e:
+        return False, f"Ошибка при загрузке файла: {str(e)}", None
+
+
+async def load_csv_async(
+    file,
+    query: Optional[HistoryQuery] = None
+) -> Tuple[bool, str, Optional[pd.DataFrame]]:
     """Асинхронная загрузка CSV файла.
 
     Args:
         file: Файловый объект (UploadedFile из Streamlit или путь к файлу)
+        query: Параметры выборки; фильтры применяются при чтении по частям
 
     Returns:
         Tuple[bool, str, Optional[pd.DataFrame]]:
@@ -73,18 +109,21 @@ async def load_csv_async(file) -> Tuple[bool, str, Optional[pd.DataFrame]]:
         else:
             content = file.getvalue().decode('utf-8')
 
-        df = pd.read_csv(StringIO(content))
-        return validate_and_prepare_dataframe(df)
+        return parse_csv(content, query)
 
     except Exception as e:
         return False, f"Ошибка при загрузке файла: {str(e)}", None
 
 
-def analyze_data(df: pd.DataFrame) -> Tuple[bool, str, Optional[Dict]]:
+def analyze_data(
+    df: pd.DataFrame,
+    store: Optional[HistoryStore] = None
+) -> Tuple[bool, str, Optional[Dict]]:
     """Анализ данных из DataFrame.
 
     Args:
         df: Подготовленный DataFrame
+        store: Уже открытое хранилище этих данных
 
     Returns:
         Tuple[bool, str, Optional[Dict]]:
@@ -94,7 +133,7 @@ def analyze_data(df: pd.DataFrame) -> Tuple[bool, str, Optional[Dict]]:
     """
     try:
         start_time = time.time()
-        results = run_parallel_analysis(df)
+        results = run_parallel_analysis(df, store)
         execution_time = time.time() - start_time
 
         return True, f"Анализ выполнен за {execution_time:.2f} секунд", results
@@ -142,39 +181,43 @@ def analyze_temperature_data(df, city):
     }
 
 
-def process_city(df_dict, city):
+def process_city(store_dir, city):
     """Функция для обработки одного города.
 
+    Процесс открывает общее хранилище через memory-map, поэтому данные
+    не копируются между процессами.
+
     Args:
-        df_dict: Словарь с данными DataFrame
+        store_dir: Каталог колоночного хранилища
         city: Название города для обработки
 
     Returns:
         dict: Результаты анализа для города
     """
-    df = pd.DataFrame(df_dict)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return analyze_temperature_data(df, city)
+    store = HistoryStoreService.open(store_dir)
+    return analyze_temperature_data(store.city_frame(city), city)
 
 
-def run_parallel_analysis(df):
+def run_parallel_analysis(df, store=None):
     """Запуск параллельного анализа для всех городов.
 
     Args:
         df: DataFrame с данными
+        store: Уже открытое хранилище этих данных; если не передано,
+            открывается или строится по df
 
     Returns:
         tuple: (результаты анализа, время выполнения)
     """
-    df_dict = df.to_dict('list')
-    cities = df['city'].unique()
+    if store is None:
+        store = HistoryStoreService.load_or_build(df)
 
     start_time = time.time()
 
     with Pool() as pool:
         results = pool.starmap(
             process_city,
-            [(df_dict, city) for city in cities]
+            [(store.directory, city) for city in store.cities]
         )
 
     parallel_results = {result['city']: result for result in results}
@@ -1,12 +1,22 @@
 import streamlit as st
 import asyncio
+from datetime import date
 from src.services.analysis_service import AnalysisService
+from src.services.comparison_service import ComparisonService
+from src.services.dataset_service import DatasetService
+from src.services.rollup_service import RollupService
+from src.services.sweep_service import SweepService
 from src.services.weather_service import WeatherService
 from src.services.visualization_service import VisualizationService
-from src.utils import load_csv_async
+from src.services.interactive_visualization_service import (
+    InteractiveVisualizationService
+)
+from src.utils import parse_csv
 from src.config import (
     DEFAULT_CITY,
-    OPENWEATHER_API_KEY
+    OPENWEATHER_API_KEY,
+    SWEEP_THRESHOLDS,
+    SWEEP_WINDOWS
 )
 from src.core.logger import logger
 
@@ -14,6 +24,56 @@ from src.core.logger import logger
 st.cache_data.clear()
 
 
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_dataset(content: bytes):
+    """Разбор загруженного файла, климатология и хранилище.
+
+    Выполняется один раз для содержимого файла; перезапуски скрипта
+    при взаимодействии с графиками получают результат из кэша.
+    """
+    success, message, df = parse_csv(content.decode('utf-8'))
+    if not success:
+        return success, message, None, None, None
+    dataset = DatasetService.from_frame(df)
+    return success, message, df, dataset.climatology, dataset.store
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def prepare_sweep(_df, fingerprint: str):
+    """Промежуточные результаты перебора параметров для набора данных.
+
+    DataFrame не хэшируется: ключом кэша служит отпечаток его содержимого,
+    поэтому изменение выбранных окон и порогов не повторяет подготовку.
+    """
+    return SweepService.prepare(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def shared_results(fingerprint: str) -> dict:
+    """Результаты анализа набора данных, общие для перезапусков и сессий.
+
+    Как и load_dataset, хранятся только для последних наборов данных.
+    """
+    return {}
+
+
+async def get_cached(fingerprint: str, key: tuple, factory):
+    """Результат асинхронного вычисления из общего кэша.
+
+    Args:
+        fingerprint: Отпечаток набора данных
+        key: Ключ результата внутри набора данных
+        factory: Функция без аргументов, возвращающая корутину
+
+    Returns:
+        Результат factory(), вычисленный при первом обращении
+    """
+    results = shared_results(fingerprint)
+    if key not in results:
+        results[key] = await factory()
+    return results[key]
+
+
 async def main():
     st.title("Анализ температурных данных")
 
@@ -24,7 +84,11 @@ async def main():
     )
 
     if uploaded_file is not None:
-        success, message, df = await load_csv_async(uploaded_file)
+        # Разбор файла, климатология по дням года и колоночное хранилище
+        # строятся один раз для набора данных и общие для всех сессий
+        success, message, df, climatology, store = load_dataset(
+            uploaded_file.getvalue()
+        )
         if not success:
             st.error(message)
             st.stop()
@@ -32,7 +96,7 @@ async def main():
         st.success(message)
 
         # Выбор города
-        cities = df['city'].unique()
+        cities = store.cities
         selected_city = st.selectbox(
             "Выберите город",
             options=cities,
@@ -41,9 +105,13 @@ async def main():
 
         st.subheader(f"Анализ данных для города {selected_city}")
         # Анализ данных
-        analysis = await AnalysisService().analyze_city_temperature(
-            df,
-            selected_city
+        analysis = await get_cached(
+            store.fingerprint,
+            ('analysis', selected_city),
+            lambda: AnalysisService().analyze_city_from_store(
+                store,
+                selected_city
+            )
         )
 
         # Получить от пользователя API ключ
@@ -56,7 +124,7 @@ async def main():
             # Получение текущей температуры
             weather = await WeatherService().get_current_temperature(
                 selected_city,
-                analysis,
+                climatology,
                 api_key
             )
             if weather.error:
@@ -65,11 +133,30 @@ async def main():
                 st.stop()
             else:
                 # Отображение результатов
-                display_results(analysis, weather)
-                display_stats(analysis)
+                display_results(analysis, weather, climatology)
+                # Месячные и годовые агрегаты, сохраненные рядом с хранилищем
+                rollups = await get_cached(
+                    store.fingerprint,
+                    ('rollups',),
+                    lambda: RollupService.load_or_build(store)
+                )
+                display_stats(analysis, rollups)
+
+        # Сравнение городов
+        if st.checkbox("Сравнить все города"):
+            comparison = await get_cached(
+                store.fingerprint,
+                ('comparison',),
+                lambda: build_comparison(store)
+            )
+            display_comparison(comparison)
+
+        # Чувствительность к окну и порогу поиска аномалий
+        if st.checkbox("Перебор параметров поиска аномалий"):
+            display_sweep(prepare_sweep(df, store.fingerprint))
 
 
-def display_results(analysis, weather_info):
+def display_results(analysis, weather_info, climatology):
     """Отображение текущей температуры и её статуса."""
     st.subheader("Текущая температура")
     if weather_info.error:
@@ -89,28 +176,22 @@ def display_results(analysis, weather_info):
         )
 
     with col2:
-        # Информация о сезоне
-        current_season = analysis.data['season'].iloc[-1]
-        season_stats = analysis.seasonal_stats.loc[current_season]
-        mean_temp = season_stats[('temperature', 'mean')]
-        std_temp = season_stats[('temperature', 'std')]
+        # Климатическая норма на дату измерения
+        current_date = weather_info.measured_on or date.today()
+        mean_temp, std_temp = climatology.lookup(analysis.city, current_date)
 
-        st.caption("Статистика текущего сезона:")
+        st.caption("Климатическая норма на текущую дату:")
         st.info(
             f"""
-            **{current_season.title()}**
+            **{current_date.strftime('%d.%m')}**
             - Средняя температура: {mean_temp:.1f}°C
             - Стандартное отклонение: {std_temp:.1f}°C
             """
         )
 
 
-def display_stats(analysis):
+def display_stats(analysis, rollups):
     """Отображение статистики и графиков анализа температур."""
-    # Инициализация сервиса визуализации
-    viz_service = VisualizationService()
-    viz_service.setup_style()
-
     # Вывод статистики
     st.subheader("Статистика по сезонам")
     st.dataframe(analysis.seasonal_stats)
@@ -119,6 +200,75 @@ def display_stats(analysis):
 
     # Графики
     st.subheader("Визуализация данных")
+    backend = st.radio(
+        "Графики",
+        options=["Интерактивные", "Статические"],
+        horizontal=True
+    )
+
+    if backend == "Интерактивные":
+        display_interactive_charts(analysis, rollups)
+    else:
+        display_static_charts(analysis, rollups)
+
+
+def display_interactive_charts(analysis, rollups):
+    """Интерактивные графики: агрегированные данные рисуются в браузере."""
+    viz_service = InteractiveVisualizationService()
+
+    # Временной ряд: выделение на обзорном графике запрашивает детализацию
+    st.write("#### Временной ряд температур")
+    event = st.altair_chart(
+        viz_service.plot_overview(rollups, analysis.city),
+        use_container_width=True,
+        on_select="rerun",
+        key=f"overview_{analysis.city}"
+    )
+    start, end = viz_service.parse_zoom(event.selection)
+    level, series, anomalies = viz_service.time_series_data(
+        analysis.data,
+        rollups,
+        analysis.city,
+        start,
+        end
+    )
+    st.altair_chart(
+        viz_service.plot_temperature_time_series(
+            level,
+            series,
+            anomalies,
+            analysis.city
+        ),
+        use_container_width=True
+    )
+
+    st.write("#### Распределение температур по сезонам")
+    st.altair_chart(
+        viz_service.plot_seasonal_boxplot(analysis.data, analysis.city),
+        use_container_width=True
+    )
+
+    st.write("#### Распределение температур")
+    st.altair_chart(
+        viz_service.plot_temperature_distribution(
+            analysis.data,
+            analysis.city
+        ),
+        use_container_width=True
+    )
+
+    st.write("#### Карта аномалий")
+    st.altair_chart(
+        viz_service.plot_anomalies_heatmap(rollups, analysis.city),
+        use_container_width=True
+    )
+
+
+def display_static_charts(analysis, rollups):
+    """Статические графики matplotlib."""
+    # Инициализация сервиса визуализации
+    viz_service = VisualizationService()
+    viz_service.setup_style()
 
     # Временной ряд
     st.write("#### Временной ряд температур")
@@ -144,14 +294,89 @@ def display_stats(analysis):
     )
     st.pyplot(fig_hist)
 
+    # Долгосрочный тренд
+    st.write("#### Долгосрочный тренд")
+    level, trend_data = RollupService.resolve(
+        rollups,
+        analysis.data,
+        analysis.city
+    )
+    fig_trend = viz_service.plot_long_term_trend(
+        trend_data,
+        analysis.city,
+        level
+    )
+    st.pyplot(fig_trend)
+
     # Тепловая карта
     st.write("#### Карта аномалий")
     fig_heatmap = viz_service.plot_anomalies_heatmap(
-        analysis.data,
+        rollups.frame('monthly', analysis.city),
         analysis.city
     )
     st.pyplot(fig_heatmap)
 
 
+async def build_comparison(store):
+    """Анализ всех городов и матрица город × дата для сравнения."""
+    analyses = await AnalysisService().analyze_all_cities_from_store(store)
+    return ComparisonService.build_from_analyses(analyses)
+
+
+def display_comparison(comparison):
+    """Отображение сравнительного анализа всех городов."""
+    viz_service = VisualizationService()
+
+    st.subheader("Сравнение городов")
+
+    st.write("#### Рейтинг городов по доле аномальных дней")
+    st.dataframe(comparison.anomaly_ranking())
+
+    st.write("#### Средняя температура по сезонам")
+    st.dataframe(comparison.seasonal_means())
+
+    st.write("#### Корреляция температурных отклонений")
+    fig_correlation = viz_service.plot_correlation_heatmap(
+        comparison.correlation()
+    )
+    st.pyplot(fig_correlation)
+
+    st.write("#### Дни с одновременными аномалиями")
+    st.dataframe(comparison.simultaneous_anomalies())
+
+    st.write("#### Совместные аномалии (количество дней)")
+    st.dataframe(comparison.co_occurrence())
+
+
+def display_sweep(sweep):
+    """Таблицы количества аномалий для набора окон и порогов."""
+    st.subheader("Чувствительность к параметрам")
+
+    thresholds = st.multiselect(
+        "Пороги (σ)",
+        options=[1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0],
+        default=list(SWEEP_THRESHOLDS)
+    )
+    windows = st.multiselect(
+        "Окна скользящего среднего (дней)",
+        options=[7, 15, 30, 60, 90, 180],
+        default=list(SWEEP_WINDOWS)
+    )
+    if not thresholds:
+        st.info("Выберите хотя бы один порог")
+        return
+
+    thresholds = sorted(thresholds)
+
+    st.write("#### Сезонное правило: город × порог")
+    st.dataframe(sweep.seasonal(thresholds))
+
+    if windows:
+        st.write(
+            "#### Отклонение от скользящего среднего: город × (окно, порог)"
+        )
+        st.dataframe(sweep.rolling(sorted(windows), thresholds))
+
+
 if __name__ == "__main__":
     asyncio.run(main())